@@ -4,11 +4,16 @@ Admin configuration for accounts app.
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as BaseUserAdmin
 from django.utils.html import format_html
-from .models import User, UserProfile, UserActivity, UserFollowing, UserBlock
+from apps.core.admin import LargeTableAdminMixin, RawIdFieldListFilter
+from apps.core.exports import ExportAdminMixin
+from .models import (
+    ACTIVITY_SEARCH_VECTOR, USER_SEARCH_VECTOR,
+    User, UserProfile, UserActivity, UserFollowing, UserBlock,
+)
 
 
 @admin.register(User)
-class UserAdmin(BaseUserAdmin):
+class UserAdmin(LargeTableAdminMixin, BaseUserAdmin):
     """
     Admin interface for User model.
     """
@@ -21,6 +26,7 @@ class UserAdmin(BaseUserAdmin):
         'is_superuser', 'created_at'
     )
     search_fields = ('email', 'username', 'first_name', 'last_name')
+    search_vector = USER_SEARCH_VECTOR
     ordering = ('-created_at',)
     
     fieldsets = (
@@ -42,9 +48,6 @@ class UserAdmin(BaseUserAdmin):
     )
     
     readonly_fields = ('created_at', 'last_active')
-    
-    def get_queryset(self, request):
-        return super().get_queryset(request).select_related('profile')
 
 
 @admin.register(UserProfile)
@@ -67,15 +70,28 @@ class UserProfileAdmin(admin.ModelAdmin):
 
 
 @admin.register(UserActivity)
-class UserActivityAdmin(admin.ModelAdmin):
+class UserActivityAdmin(LargeTableAdminMixin, ExportAdminMixin, admin.ModelAdmin):
     """
     Admin interface for UserActivity model.
     """
     list_display = ('user', 'activity_type', 'created_at', 'ip_address')
-    list_filter = ('activity_type', 'created_at')
-    search_fields = ('user__email', 'user__username', 'activity_type', 'description')
+    list_filter = ('activity_type', ('user', RawIdFieldListFilter), 'created_at')
+    list_select_related = ('user',)
+    raw_id_fields = ('user',)
+    search_fields = ('description',)
+    search_vector = ACTIVITY_SEARCH_VECTOR
     readonly_fields = ('created_at', 'updated_at')
     ordering = ('-created_at',)
+    export_columns = (
+        ('user', 'user_id'),
+        ('user_email', 'user__email'),
+        ('activity_type', 'activity_type'),
+        ('description', 'description'),
+        ('ip_address', 'ip_address'),
+        ('user_agent', 'user_agent'),
+        ('metadata', 'metadata'),
+        ('created_at', 'created_at'),
+    )
     
     def has_add_permission(self, request):
         return False
@@ -0,0 +1,77 @@
+"""
+Authentication classes for accounts app.
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from .models import User
+from .tokens import VERSION_CLAIM, is_token_revoked
+
+# User fields needed by authentication and permission checks
+PRINCIPAL_FIELDS = (
+    'id', 'is_active', 'is_staff', 'is_superuser',
+    'is_verified', 'is_banned', 'is_seller', 'token_version',
+)
+
+
+def principal_cache_key(user_id):
+    return f'auth:principal:{user_id}'
+
+
+def invalidate_principal(user_id):
+    cache.delete(principal_cache_key(user_id))
+
+
+def get_principal(user_id):
+    """
+    Return the cached principal fields of a user, or None if there is no such user.
+    """
+    key = principal_cache_key(user_id)
+    principal = cache.get(key)
+    if principal is None:
+        principal = User.objects.filter(
+            **{api_settings.USER_ID_FIELD: user_id}
+        ).values(*PRINCIPAL_FIELDS).first()
+        if principal is None:
+            return None
+        cache.set(key, principal, getattr(settings, 'AUTH_PRINCIPAL_CACHE_TIMEOUT', 300))
+    return principal
+
+
+def check_token_is_current(token, principal):
+    """
+    Reject tokens that were revoked individually or by a token version bump.
+    """
+    if token.get(VERSION_CLAIM, 0) != principal['token_version'] or is_token_revoked(token):
+        raise InvalidToken(_('Token has been revoked'))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that caches the minimal user principal.
+
+    The request user is a ``User`` instance holding only
+    ``PRINCIPAL_FIELDS``, so permission and revocation checks need no
+    query. Touching any other field loads the rest of the row in a single
+    query.
+    """
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_('Token contained no recognizable user identification'))
+
+        principal = get_principal(user_id)
+        if principal is None:
+            raise AuthenticationFailed(_('User not found'), code='user_not_found')
+        check_token_is_current(validated_token, principal)
+
+        user = User.from_principal(principal)
+        if not user.is_active:
+            raise AuthenticationFailed(_('User is inactive'), code='user_inactive')
+
+        return user
\ No newline at end of file
@@ -2,12 +2,18 @@
 User models for New Revolution marketplace.
 """
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
 from django.core.validators import RegexValidator
 from apps.core.models import TimeStampedModel
 from apps.core.utils import generate_user_avatar_path
 import uuid
 
+# Full-text search documents for the admin, backed by GIN indexes
+USER_SEARCH_VECTOR = SearchVector('username', 'email', 'first_name', 'last_name', config='simple')
+ACTIVITY_SEARCH_VECTOR = SearchVector('description', config='simple')
+
 
 class User(AbstractUser):
     """
@@ -39,6 +45,8 @@ class User(AbstractUser):
     is_banned = models.BooleanField(default=False)
     ban_reason = models.TextField(blank=True)
     banned_until = models.DateTimeField(null=True, blank=True)
+    # Bumped to revoke every token issued before (see apps.accounts.tokens)
+    token_version = models.PositiveIntegerField(default=0)
     
     # Seller information
     is_seller = models.BooleanField(default=False)
@@ -62,10 +70,58 @@ class User(AbstractUser):
         db_table = 'users'
         verbose_name = 'User'
         verbose_name_plural = 'Users'
+        indexes = [
+            models.Index(fields=['-created_at'], name='users_created_idx'),
+            GinIndex(USER_SEARCH_VECTOR, name='users_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.get_full_name()} ({self.email})"
 
+    @classmethod
+    def from_principal(cls, principal):
+        """Build a partially loaded user from cached principal fields."""
+        field_names = [
+            field.attname for field in cls._meta.concrete_fields
+            if field.attname in principal
+        ]
+        user = cls.from_db('default', field_names, [principal[name] for name in field_names])
+        user._is_principal = True
+        return user
+
+    def refresh_from_db(self, using=None, fields=None):
+        """
+        Load every deferred field at once for cached principals, instead of
+        one query per field accessed.
+        """
+        if fields is not None and getattr(self, '_is_principal', False):
+            deferred = self.get_deferred_fields()
+            if set(fields) <= deferred:
+                fields = list(deferred)
+        super().refresh_from_db(using=using, fields=fields)
+
+    def save(self, *args, **kwargs):
+        """
+        Save, keeping auto-now timestamps current for cached principals.
+
+        Django saves a partially loaded instance with ``update_fields`` set
+        to its loaded fields, which would leave ``updated_at`` (and the
+        conditional GET validators built on it) unchanged.
+        """
+        if (
+            getattr(self, '_is_principal', False)
+            and kwargs.get('update_fields') is None
+            and self.get_deferred_fields()
+        ):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key and (
+                    field.attname not in deferred or getattr(field, 'auto_now', False)
+                )
+            ]
+        super().save(*args, **kwargs)
+
     def get_full_name(self):
         """Return the full name of the user."""
         return f"{self.first_name} {self.last_name}".strip()
@@ -85,11 +141,17 @@ class User(AbstractUser):
         """Check if user is an active seller."""
         return self.is_seller and not self.is_banned and self.is_verified
 
+    def revoke_all_sessions(self):
+        """Invalidate every token issued to the user so far."""
+        self.token_version += 1
+        self.save(update_fields=['token_version'])
+
     def ban_user(self, reason, until=None):
-        """Ban the user."""
+        """Ban the user and end their sessions."""
         self.is_banned = True
         self.ban_reason = reason
         self.banned_until = until
+        self.token_version += 1
         self.save()
 
     def unban_user(self):
@@ -188,6 +250,11 @@ class UserActivity(TimeStampedModel):
         verbose_name = 'User Activity'
         verbose_name_plural = 'User Activities'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['-created_at'], name='user_activities_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='user_activities_user_idx'),
+            GinIndex(ACTIVITY_SEARCH_VECTOR, name='user_activities_search_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.display_name} - {self.activity_type} at {self.created_at}"
@@ -5,8 +5,14 @@ from rest_framework import serializers
 from django.contrib.auth import authenticate
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer as BaseTokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from .authentication import check_token_is_current, get_principal
 from .models import User, UserProfile, UserActivity
-from apps.core.utils import generate_verification_code, send_notification_email
+from .tokens import revocation_store
+from apps.core.utils import generate_verification_code, queue_notification_email
 import uuid
 
 
@@ -47,12 +53,13 @@ class UserRegistrationSerializer(serializers.ModelSerializer):
         user.email_verification_token = str(uuid.uuid4())
         user.save()
         
-        # Send verification email
-        send_notification_email(
+        # Queue verification email
+        queue_notification_email(
             user=user,
             subject='Welcome to New Revolution - Verify Your Email',
             template='welcome_verification',
-            context={'verification_token': user.email_verification_token}
+            context={'verification_token': user.email_verification_token},
+            idempotency_key=f'welcome_verification:{user.pk}',
         )
         
         return user
@@ -87,6 +94,27 @@ class UserLoginSerializer(serializers.Serializer):
             raise serializers.ValidationError('Must include email and password.')
 
 
+class TokenRefreshSerializer(BaseTokenRefreshSerializer):
+    """
+    Refresh serializer that honours token revocation.
+
+    With refresh token rotation, the token that was exchanged is revoked.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+        principal = get_principal(refresh[api_settings.USER_ID_CLAIM])
+        if principal is None or not principal['is_active']:
+            raise InvalidToken(_('Token user is not available'))
+        check_token_is_current(refresh, principal)
+
+        jti, expires_at = refresh['jti'], refresh['exp']
+        data = super().validate(attrs)
+        if api_settings.ROTATE_REFRESH_TOKENS and api_settings.BLACKLIST_AFTER_ROTATION:
+            revocation_store.revoke(jti, expires_at)
+        return data
+
+
 class UserProfileSerializer(serializers.ModelSerializer):
     """
     Serializer for user profile.
@@ -1,8 +1,9 @@
 """
 Signals for accounts app.
 """
-from django.db.models.signals import post_save
+from django.db.models.signals import post_save, post_delete
 from django.dispatch import receiver
+from .authentication import invalidate_principal
 from .models import User, UserProfile
 
 
@@ -21,4 +22,13 @@ def save_user_profile(sender, instance, **kwargs):
     Save UserProfile when User is saved.
     """
     if hasattr(instance, 'profile'):
-        instance.profile.save()
\ No newline at end of file
+        instance.profile.save()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_user_principal(sender, instance, **kwargs):
+    """
+    Drop the cached authentication principal when a user changes.
+    """
+    invalidate_principal(instance.pk)
\ No newline at end of file
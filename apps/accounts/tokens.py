@@ -0,0 +1,193 @@
+"""
+Token issuing and revocation for accounts app.
+"""
+import hashlib
+import threading
+import time
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.tokens import RefreshToken
+
+# Claim carrying the user's token version when the token was issued
+VERSION_CLAIM = 'ver'
+
+GENERATION_KEY = 'auth:revocation:generation'
+REPLAY_CHUNK_SIZE = 1000
+
+
+def _revoked_key(jti):
+    return f'auth:revoked:{jti}'
+
+
+def _log_key(generation):
+    return f'auth:revocation:log:{generation}'
+
+
+def tokens_for_user(user):
+    """
+    Issue a refresh token (and, through it, access tokens) for a user.
+    """
+    refresh = RefreshToken.for_user(user)
+    refresh[VERSION_CLAIM] = user.token_version
+    return refresh
+
+
+class BloomFilter:
+    """
+    Fixed-size in-process Bloom filter over strings.
+    """
+
+    def __init__(self, size_bits=2 ** 21, hash_count=7):
+        self.size_bits = size_bits
+        self.hash_count = hash_count
+        self.count = 0
+        self._bits = bytearray(size_bits // 8)
+
+    def _positions(self, value):
+        digest = hashlib.blake2b(value.encode(), digest_size=8 * self.hash_count).digest()
+        for i in range(self.hash_count):
+            yield int.from_bytes(digest[i * 8:(i + 1) * 8], 'big') % self.size_bits
+
+    def add(self, value):
+        for position in self._positions(value):
+            self._bits[position // 8] |= 1 << (position % 8)
+        self.count += 1
+
+    def __contains__(self, value):
+        return all(
+            self._bits[position // 8] & (1 << (position % 8))
+            for position in self._positions(value)
+        )
+
+
+class RevocationStore:
+    """
+    Revoked token ids, held in the shared cache until the token expires.
+
+    Each revocation is also appended to a numbered log in the cache. Every
+    process replays new log entries into a local Bloom filter at most every
+    ``AUTH_REVOCATION_SYNC_INTERVAL`` seconds, so checking a token that was
+    never revoked (the common case) needs no cache round trip. Only Bloom
+    filter hits are confirmed against the cache.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bloom = BloomFilter()
+        self._generation = None
+        # Revocations up to this generation are not in the filter
+        self._floor = 0
+        # (generation, time) when log entries up to generation were first
+        # seen missing
+        self._gap = None
+        self._bypass = False
+        self._last_sync = 0.0
+
+    @property
+    def log_timeout(self):
+        lifetime = settings.SIMPLE_JWT['REFRESH_TOKEN_LIFETIME']
+        return int(lifetime.total_seconds()) + 1
+
+    def revoke(self, jti, expires_at):
+        """
+        Revoke a token id until ``expires_at`` (epoch seconds).
+        """
+        ttl = int(expires_at - time.time()) + 1
+        if ttl <= 1:
+            return
+
+        cache.set(_revoked_key(jti), 1, ttl)
+        cache.add(GENERATION_KEY, 0, None)
+        generation = cache.incr(GENERATION_KEY)
+        # Every log entry outlives any token, so entries expire oldest first
+        cache.set(_log_key(generation), jti, self.log_timeout)
+        with self._lock:
+            self._bloom.add(jti)
+
+    def is_revoked(self, jti):
+        self._sync()
+        if not self._bypass and jti not in self._bloom:
+            return False
+        return cache.get(_revoked_key(jti)) is not None
+
+    def _replay(self, start, end):
+        """
+        Add log entries ``start + 1`` to ``end`` to the filter.
+
+        Returns the generation up to which every entry was replayed. An
+        entry can be missing because its ``revoke()`` has taken the
+        generation but not yet written the entry, so replay resumes from
+        the first missing one on the next sync. Entries still missing
+        ``AUTH_REVOCATION_GAP_TIMEOUT`` seconds after they were first seen
+        missing have expired or lost their writer, and are skipped.
+        """
+        now = time.monotonic()
+        timeout = getattr(settings, 'AUTH_REVOCATION_GAP_TIMEOUT', 10)
+        skip_through = self._gap[0] if self._gap and now - self._gap[1] >= timeout else 0
+        complete = start
+        missing = False
+        for chunk_start in range(start + 1, end + 1, REPLAY_CHUNK_SIZE):
+            chunk_end = min(chunk_start + REPLAY_CHUNK_SIZE, end + 1)
+            generations = range(chunk_start, chunk_end)
+            entries = cache.get_many([_log_key(generation) for generation in generations])
+            for generation in generations:
+                jti = entries.get(_log_key(generation))
+                if jti is not None:
+                    if jti not in self._bloom:
+                        self._bloom.add(jti)
+                elif generation > skip_through:
+                    missing = True
+                if not missing:
+                    complete = generation
+
+        if not missing:
+            self._gap = None
+        elif self._gap is None or skip_through:
+            self._gap = (end, now)
+        return complete
+
+    def _sync(self):
+        interval = getattr(settings, 'AUTH_REVOCATION_SYNC_INTERVAL', 1)
+        if time.monotonic() - self._last_sync < interval:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            if now - self._last_sync < interval:
+                return
+            self._last_sync = now
+
+            current = cache.get(GENERATION_KEY) or 0
+            if self._generation is not None and current < self._generation:
+                # The cache was flushed, and the revocations with it
+                self._bloom = BloomFilter()
+                self._generation = None
+                self._floor = 0
+                self._gap = None
+            if self._generation is None or current > self._generation:
+                start = self._generation or 0
+                limit = getattr(settings, 'AUTH_REVOCATION_FILTER_CAPACITY', 100000)
+                if self._bloom.count + current - start > limit:
+                    # Rebuild from the most recent revocations so the
+                    # false positive rate stays low
+                    self._bloom = BloomFilter()
+                    start = self._floor = max(0, current - limit)
+                self._generation = self._replay(start, current)
+
+            # While revocations left out of the filter are still live,
+            # confirm every token against the cache
+            self._bypass = bool(self._floor) and cache.get(_log_key(self._floor)) is not None
+
+
+revocation_store = RevocationStore()
+
+
+def revoke_token(token):
+    """
+    Revoke a SimpleJWT token until it would have expired anyway.
+    """
+    revocation_store.revoke(token['jti'], token['exp'])
+
+
+def is_token_revoked(token):
+    return revocation_store.is_revoked(token['jti'])
\ No newline at end of file
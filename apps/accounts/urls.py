@@ -29,6 +29,7 @@ urlpatterns = [
     
     # Activities
     path('activities/', views.UserActivityListView.as_view(), name='activities'),
+    path('activities/export/', views.UserActivityExportView.as_view(), name='activities-export'),
     
     # Seller
     path('become-seller/', views.become_seller, name='become_seller'),
@@ -4,20 +4,26 @@ Views for the accounts app.
 from rest_framework import generics, status, permissions
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework_simplejwt.views import TokenObtainPairView
 from django.contrib.auth import login
 from django.shortcuts import get_object_or_404
 from django.utils import timezone
-from django_ratelimit.decorators import ratelimit
-from django.utils.decorators import method_decorator
+from django.db.models import CharField, Count, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Concat
 from .models import User, UserActivity
+from .tokens import revoke_token, tokens_for_user
 from .serializers import (
     UserRegistrationSerializer, UserLoginSerializer, UserProfileSerializer,
     UserProfileDetailSerializer, PasswordChangeSerializer, EmailVerificationSerializer,
     PhoneVerificationSerializer, UserActivitySerializer, PublicUserSerializer
 )
-from apps.core.utils import generate_verification_code, send_notification_email
+from apps.core.cache import ConditionalRetrieveMixin
+from apps.core.exports import ExportView
+from apps.core.throttling import throttle_scope
+from apps.core.utils import generate_verification_code, queue_notification_email
 import logging
 
 logger = logging.getLogger(__name__)
@@ -30,8 +36,8 @@ class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'register'
 
-    @method_decorator(ratelimit(key='ip', rate='5/m', method='POST'))
     def post(self, request, *args, **kwargs):
         response = super().post(request, *args, **kwargs)
         
@@ -63,8 +69,8 @@ class UserLoginView(TokenObtainPairView):
     User login endpoint with JWT tokens.
     """
     permission_classes = [permissions.AllowAny]
+    throttle_scope = 'login'
 
-    @method_decorator(ratelimit(key='ip', rate='10/m', method='POST'))
     def post(self, request, *args, **kwargs):
         serializer = UserLoginSerializer(data=request.data)
         
@@ -72,7 +78,7 @@ class UserLoginView(TokenObtainPairView):
             user = serializer.validated_data['user']
             
             # Generate JWT tokens
-            refresh = RefreshToken.for_user(user)
+            refresh = tokens_for_user(user)
             access_token = refresh.access_token
             
             # Update last active
@@ -102,6 +108,9 @@ class UserLoginView(TokenObtainPairView):
 class UserLogoutView(generics.GenericAPIView):
     """
     User logout endpoint.
+
+    Revokes the access token used for the request and the given refresh
+    token. With ``"all": true`` every session of the user is ended.
     """
     permission_classes = [permissions.IsAuthenticated]
 
@@ -110,7 +119,14 @@ class UserLogoutView(generics.GenericAPIView):
             refresh_token = request.data.get('refresh')
             if refresh_token:
                 token = RefreshToken(refresh_token)
-                token.blacklist()
+                if str(token.get(api_settings.USER_ID_CLAIM)) != str(request.user.pk):
+                    return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
+                revoke_token(token)
+
+            if request.data.get('all'):
+                request.user.revoke_all_sessions()
+            elif request.auth is not None:
+                revoke_token(request.auth)
             
             # Log logout activity
             UserActivity.objects.create(
@@ -124,6 +140,9 @@ class UserLogoutView(generics.GenericAPIView):
             logger.info(f"User logged out: {request.user.email}")
             
             return Response({'message': 'Logout successful'}, status=status.HTTP_200_OK)
+        except TokenError as e:
+            logger.warning(f"Logout with invalid refresh token for {request.user.email}: {str(e)}")
+            return Response({'error': 'Invalid refresh token'}, status=status.HTTP_400_BAD_REQUEST)
         except Exception as e:
             logger.error(f"Logout error for {request.user.email}: {str(e)}")
             return Response({'error': 'Logout failed'}, status=status.HTTP_400_BAD_REQUEST)
@@ -168,7 +187,7 @@ class UserProfileDetailView(generics.RetrieveAPIView):
         return self.request.user
 
 
-class PublicUserProfileView(generics.RetrieveAPIView):
+class PublicUserProfileView(ConditionalRetrieveMixin, generics.RetrieveAPIView):
     """
     Public user profile view (for viewing other users).
     """
@@ -177,6 +196,38 @@ class PublicUserProfileView(generics.RetrieveAPIView):
     permission_classes = [permissions.AllowAny]
     lookup_field = 'id'
 
+    def get_conditional_validators(self, request):
+        from apps.products.models import Product
+        from apps.reviews.models import Review
+
+        product_stats = (
+            Product.objects.filter(seller=OuterRef('pk'), is_active=True)
+            .order_by().values('seller')
+            .annotate(version=Concat(Count('id'), Value(':'), Max('updated_at'), output_field=CharField()))
+            .values('version')
+        )
+        review_stats = (
+            Review.objects.filter(product__seller=OuterRef('pk'))
+            .order_by().values('product__seller')
+            .annotate(total=Count('id'))
+            .values('total')
+        )
+        row = (
+            self.get_queryset()
+            .filter(id=self.kwargs['id'])
+            .values('updated_at', 'seller_rating', 'total_sales', 'is_verified', 'is_seller')
+            .annotate(
+                products_version=Subquery(product_stats),
+                review_count=Subquery(review_stats),
+            )
+            .first()
+        )
+        if row is None:
+            return None
+
+        # Product counts can change without touching the user row
+        return list(row.values()), None
+
 
 class PasswordChangeView(generics.GenericAPIView):
     """
@@ -184,8 +235,8 @@ class PasswordChangeView(generics.GenericAPIView):
     """
     serializer_class = PasswordChangeSerializer
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = 'password_change'
 
-    @method_decorator(ratelimit(key='user', rate='3/m', method='POST'))
     def post(self, request):
         serializer = self.get_serializer(data=request.data)
         
@@ -208,9 +259,9 @@ class PasswordChangeView(generics.GenericAPIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@throttle_scope('verify_email')
 @api_view(['POST'])
 @permission_classes([permissions.AllowAny])
-@ratelimit(key='ip', rate='5/m', method='POST')
 def verify_email(request):
     """
     Email verification endpoint.
@@ -242,9 +293,9 @@ def verify_email(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@throttle_scope('phone_verification_send')
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-@ratelimit(key='user', rate='3/m', method='POST')
 def send_phone_verification(request):
     """
     Send phone verification code.
@@ -275,9 +326,9 @@ def send_phone_verification(request):
     return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+@throttle_scope('verify_phone')
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
-@ratelimit(key='user', rate='5/m', method='POST')
 def verify_phone(request):
     """
     Verify phone number with code.
@@ -321,6 +372,25 @@ class UserActivityListView(generics.ListAPIView):
         return UserActivity.objects.filter(user=self.request.user).order_by('-created_at')
 
 
+class UserActivityExportView(ExportView):
+    """
+    Stream the current user's activity as CSV or JSONL.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    export_name = 'activity'
+    export_columns = (
+        ('activity_type', 'activity_type'),
+        ('description', 'description'),
+        ('ip_address', 'ip_address'),
+        ('user_agent', 'user_agent'),
+        ('metadata', 'metadata'),
+        ('created_at', 'created_at'),
+    )
+
+    def get_queryset(self):
+        return UserActivity.objects.filter(user=self.request.user).order_by('-created_at')
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def become_seller(request):
@@ -347,11 +417,12 @@ def become_seller(request):
         user_agent=request.META.get('HTTP_USER_AGENT', ''),
     )
     
-    # Send welcome email
-    send_notification_email(
+    # Queue welcome email
+    queue_notification_email(
         user=user,
         subject='Welcome to New Revolution Sellers!',
         template='seller_welcome',
+        idempotency_key=f'seller_welcome:{user.pk}',
     )
     
     logger.info(f"User became seller: {user.email}")
@@ -368,6 +439,9 @@ def delete_account(request):
     """
     Delete user account.
     """
+    from apps.chat.models import Conversation
+    from apps.products.models import Product, ProductImage
+
     user = request.user
     
     # Log account deletion activity
@@ -385,5 +459,10 @@ def delete_account(request):
     user.is_active = False
     user.email = f"deleted_{user.id}@deleted.com"
     user.save()
+
+    # Take down the user's listings and conversations in batched UPDATEs
+    ProductImage.objects.filter(product__seller=user).soft_delete()
+    Product.objects.filter(seller=user).soft_delete()
+    Conversation.objects.filter(participants=user).soft_delete()
     
     return Response({'message': 'Account deleted successfully'}, status=status.HTTP_200_OK)
\ No newline at end of file
@@ -2,6 +2,7 @@
 Admin configuration for categories app.
 """
 from django.contrib import admin
+from django.db.models import Count, Q
 from mptt.admin import MPTTModelAdmin
 from .models import Category
 
@@ -21,4 +22,21 @@ class CategoryAdmin(MPTTModelAdmin):
         ('Display', {
             'fields': ('icon', 'image', 'order', 'is_active')
         }),
-    )
\ No newline at end of file
+    )
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request).select_related('parent')
+        # Only the changelist shows counts; autocomplete lookups skip the join
+        match = request.resolver_match
+        if match and match.url_name == 'categories_category_changelist':
+            queryset = queryset.annotate(
+                active_product_count=Count(
+                    'products',
+                    filter=Q(products__is_active=True, products__is_deleted=False),
+                )
+            )
+        return queryset
+
+    @admin.display(description='Products', ordering='active_product_count')
+    def product_count(self, obj):
+        return obj.active_product_count
\ No newline at end of file
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class CategoriesConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.categories'
-    verbose_name = 'Categories'
\ No newline at end of file
+    verbose_name = 'Categories'
+
+    def ready(self):
+        from apps.core.cache import track_model_version
+        track_model_version(self.get_model('Category'))
\ No newline at end of file
@@ -40,4 +40,4 @@ class Category(MPTTModel, TimeStampedModel):
     @property
     def product_count(self):
         """Get the number of active products in this category."""
-        return self.products.filter(is_active=True, is_deleted=False).count()
\ No newline at end of file
+        return self.products.filter(is_active=True).count()
\ No newline at end of file
@@ -5,11 +5,33 @@ from rest_framework import serializers
 from .models import Category
 
 
+class CategoryCountField(serializers.ReadOnlyField):
+    """
+    Product count, from the ``active_product_count`` annotation when present.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['source'] = '*'
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        count = getattr(obj, 'active_product_count', None)
+        return obj.product_count if count is None else count
+
+
+def _prefetched_children(serializer, obj):
+    """Active children from the ``category_children`` context, or None."""
+    children = serializer.context.get('category_children')
+    if children is None:
+        return None
+    return children.get(obj.pk, [])
+
+
 class CategorySerializer(serializers.ModelSerializer):
     """
     Serializer for categories.
     """
-    product_count = serializers.ReadOnlyField()
+    product_count = CategoryCountField()
     children = serializers.SerializerMethodField()
 
     class Meta:
@@ -21,6 +43,9 @@ class CategorySerializer(serializers.ModelSerializer):
 
     def get_children(self, obj):
         """Get child categories."""
+        children = _prefetched_children(self, obj)
+        if children is not None:
+            return CategorySerializer(children, many=True, context=self.context).data
         if obj.children.exists():
             return CategorySerializer(
                 obj.children.filter(is_active=True),
@@ -35,7 +60,7 @@ class CategoryTreeSerializer(serializers.ModelSerializer):
     Serializer for category tree structure.
     """
     children = serializers.SerializerMethodField()
-    product_count = serializers.ReadOnlyField()
+    product_count = CategoryCountField()
 
     class Meta:
         model = Category
@@ -43,5 +68,7 @@ class CategoryTreeSerializer(serializers.ModelSerializer):
 
     def get_children(self, obj):
         """Get child categories recursively."""
-        children = obj.get_children().filter(is_active=True)
+        children = _prefetched_children(self, obj)
+        if children is None:
+            children = obj.get_children().filter(is_active=True)
         return CategoryTreeSerializer(children, many=True, context=self.context).data
\ No newline at end of file
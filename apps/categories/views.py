@@ -1,27 +1,71 @@
 """
 Views for categories app.
 """
+from collections import defaultdict
+from django.db.models import Count, Q
 from rest_framework import generics, permissions
+from apps.core.cache import CachedCatalogMixin
+from apps.products.models import Product
 from .models import Category
 from .serializers import CategorySerializer, CategoryTreeSerializer
 
 
-class CategoryListView(generics.ListAPIView):
+def with_product_count(queryset):
+    """
+    Annotate categories with their active product count, in the same query.
+    """
+    return queryset.annotate(
+        active_product_count=Count(
+            'products',
+            filter=Q(products__is_active=True, products__is_deleted=False),
+        )
+    )
+
+
+class CategoryChildrenMixin:
+    """
+    Give the serializers every active child category up front.
+
+    The children of all categories come from one query, grouped by parent
+    in the ``category_children`` serializer context, instead of one query
+    per category and level.
+    """
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        children = defaultdict(list)
+        for category in with_product_count(
+            Category.objects.filter(is_active=True, parent__isnull=False)
+        ).order_by('order', 'name'):
+            children[category.parent_id].append(category)
+        context['category_children'] = children
+        return context
+
+
+class CategoryListView(CategoryChildrenMixin, CachedCatalogMixin, generics.ListAPIView):
     """
     List all active categories.
     """
-    queryset = Category.objects.filter(is_active=True).order_by('order', 'name')
+    # Product changes move the product counts in these responses
+    catalog_models = (Category, Product)
+    queryset = with_product_count(Category.objects.filter(is_active=True)).order_by('order', 'name')
     serializer_class = CategorySerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 5
 
 
-class CategoryTreeView(generics.ListAPIView):
+class CategoryTreeView(CategoryChildrenMixin, CachedCatalogMixin, generics.ListAPIView):
     """
     Get category tree structure.
     """
-    queryset = Category.objects.filter(is_active=True, parent=None).order_by('order', 'name')
+    # Product changes move the product counts in these responses
+    catalog_models = (Category, Product)
+    queryset = with_product_count(
+        Category.objects.filter(is_active=True, parent=None)
+    ).order_by('order', 'name')
     serializer_class = CategoryTreeSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 5
 
 
 class CategoryDetailView(generics.RetrieveAPIView):
@@ -2,18 +2,19 @@
 Admin configuration for chat app.
 """
 from django.contrib import admin
+from apps.core.admin import SoftDeleteAdmin
 from .models import Conversation, Message
 
 
 @admin.register(Conversation)
-class ConversationAdmin(admin.ModelAdmin):
+class ConversationAdmin(SoftDeleteAdmin):
     list_display = ('id', 'product', 'is_active', 'created_at')
     list_filter = ('is_active', 'created_at')
     filter_horizontal = ('participants',)
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(SoftDeleteAdmin):
     list_display = ('conversation', 'sender', 'content', 'is_read', 'created_at')
     list_filter = ('is_read', 'created_at')
     search_fields = ('content', 'sender__email')
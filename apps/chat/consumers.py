@@ -2,9 +2,12 @@
 WebSocket consumers for chat app.
 """
 import json
+import time
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
 from django.contrib.auth import get_user_model
+from django.utils import timezone
+from apps.core.metrics import observe_channel_publish, websocket_closed, websocket_opened
 from .models import Conversation, Message
 
 User = get_user_model()
@@ -22,8 +25,13 @@ class ChatConsumer(AsyncWebsocketConsumer):
         )
 
         await self.accept()
+        self.connection_counted = True
+        websocket_opened()
 
     async def disconnect(self, close_code):
+        if getattr(self, 'connection_counted', False):
+            websocket_closed()
+
         # Leave room group
         await self.channel_layer.group_discard(
             self.room_group_name,
@@ -39,6 +47,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
         await self.save_message(user, message)
 
         # Send message to room group
+        started = time.perf_counter()
         await self.channel_layer.group_send(
             self.room_group_name,
             {
@@ -48,6 +57,7 @@ class ChatConsumer(AsyncWebsocketConsumer):
                 'timestamp': str(timezone.now())
             }
         )
+        observe_channel_publish(time.perf_counter() - started)
 
     async def chat_message(self, event):
         message = event['message']
@@ -2,6 +2,7 @@
 Chat models for New Revolution marketplace.
 """
 from django.db import models
+from django.db.models import Q
 from apps.core.models import BaseModel
 
 
@@ -35,6 +36,9 @@ class Conversation(BaseModel):
     @property
     def last_message(self):
         """Get the last message in this conversation."""
+        # Set by list views that prefetch it
+        if hasattr(self, 'latest_messages'):
+            return self.latest_messages[0] if self.latest_messages else None
         return self.messages.first()
 
 
@@ -61,6 +65,13 @@ class Message(BaseModel):
         verbose_name = 'Message'
         verbose_name_plural = 'Messages'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['conversation', '-created_at'],
+                name='messages_live_conversation_idx',
+                condition=Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return f"Message from {self.sender.display_name}: {self.content[:50]}"
\ No newline at end of file
@@ -2,6 +2,7 @@
 Serializers for chat app.
 """
 from rest_framework import serializers
+from apps.core.serializers import ValuesSerializer, datetime_string, display_name
 from .models import Conversation, Message
 
 
@@ -20,6 +21,22 @@ class MessageSerializer(serializers.ModelSerializer):
         read_only_fields = ('sender', 'created_at')
 
 
+class MessageValuesSerializer(ValuesSerializer):
+    """
+    Fast path producing the same output as MessageSerializer.
+    """
+    field_map = (
+        ('id', 'id', None),
+        ('conversation', 'conversation_id', None),
+        ('sender', 'sender_id', None),
+        ('sender_name', ('sender__first_name', 'sender__last_name', 'sender__username'), display_name),
+        ('content', 'content', None),
+        ('is_read', 'is_read', None),
+        ('read_at', 'read_at', datetime_string),
+        ('created_at', 'created_at', datetime_string),
+    )
+
+
 class ConversationSerializer(serializers.ModelSerializer):
     """
     Serializer for conversations.
@@ -2,9 +2,28 @@
 Views for chat app.
 """
 from rest_framework import generics, permissions
-from django.db.models import Q
+from django.db.models import Prefetch, Q
 from .models import Conversation, Message
-from .serializers import ConversationSerializer, MessageSerializer
+from apps.core.serializers import ValuesListMixin
+from .serializers import ConversationSerializer, MessageSerializer, MessageValuesSerializer
+
+
+def _user_conversations(user):
+    """
+    Active conversations of ``user``, with what ConversationSerializer reads
+    prefetched: participants, and the last message with its sender.
+    """
+    return Conversation.objects.filter(
+        participants=user,
+        is_active=True
+    ).prefetch_related(
+        'participants',
+        Prefetch(
+            'messages',
+            queryset=Message.objects.select_related('sender').order_by('-created_at')[:1],
+            to_attr='latest_messages',
+        ),
+    )
 
 
 class ConversationListCreateView(generics.ListCreateAPIView):
@@ -13,12 +32,10 @@ class ConversationListCreateView(generics.ListCreateAPIView):
     """
     serializer_class = ConversationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 15
 
     def get_queryset(self):
-        return Conversation.objects.filter(
-            participants=self.request.user,
-            is_active=True
-        ).distinct()
+        return _user_conversations(self.request.user).distinct()
 
 
 class ConversationDetailView(generics.RetrieveAPIView):
@@ -29,24 +46,24 @@ class ConversationDetailView(generics.RetrieveAPIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get_queryset(self):
-        return Conversation.objects.filter(
-            participants=self.request.user,
-            is_active=True
-        )
+        return _user_conversations(self.request.user)
 
 
-class MessageListCreateView(generics.ListCreateAPIView):
+class MessageListCreateView(ValuesListMixin, generics.ListCreateAPIView):
     """
     List messages in a conversation or create a new message.
     """
     serializer_class = MessageSerializer
+    values_serializer_class = MessageValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 10
 
     def get_queryset(self):
         conversation_id = self.kwargs['conversation_id']
         return Message.objects.filter(
             conversation_id=conversation_id,
-            conversation__participants=self.request.user
+            conversation__participants=self.request.user,
+            conversation__is_deleted=False
         ).order_by('-created_at')
 
     def perform_create(self, serializer):
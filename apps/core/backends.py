@@ -1,7 +1,12 @@
 """
 Custom backends for New Revolution.
 """
-import resend
+import hashlib
+import threading
+import time
+import uuid
+import requests
+from requests.adapters import HTTPAdapter
 from django.core.mail.backends.base import BaseEmailBackend
 from django.conf import settings
 from django.core.mail import EmailMessage
@@ -9,17 +14,63 @@ import logging
 
 logger = logging.getLogger(__name__)
 
+_local = threading.local()
+
+# Message header carrying a stable key for the message, e.g. its outbox key.
+# It is sent to Resend as the Idempotency-Key of the request.
+IDEMPOTENCY_HEADER = 'X-Idempotency-Key'
+
+
+def get_resend_session():
+    """
+    Return a keep-alive HTTP session for the Resend API.
+
+    Sessions are kept per thread so connections are reused across sends
+    without sharing a connection pool between threads.
+    """
+    session = getattr(_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        _local.session = session
+    return session
+
+
+class ResendAPIError(Exception):
+    """
+    Raised when the Resend API rejects a request.
+    """
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
 
 class ResendEmailBackend(BaseEmailBackend):
     """
     Email backend using Resend service.
+
+    Messages are sent over a persistent session. Calls with more than one
+    message use the batch endpoint (up to ``BATCH_SIZE`` per request), and
+    transient failures (network errors, 429 and 5xx) are retried with
+    exponential backoff. Every request carries an ``Idempotency-Key`` so a
+    retry of a request Resend already accepted does not send the emails
+    twice. The key comes from the messages' ``X-Idempotency-Key`` headers,
+    so retries across separate sends are deduplicated too; messages without
+    one get a key for the duration of the send.
     """
-    
+    BATCH_SIZE = 100
+    RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
     def __init__(self, fail_silently=False, **kwargs):
         super().__init__(fail_silently=fail_silently, **kwargs)
         self.api_key = getattr(settings, 'RESEND_API_KEY', '')
-        if self.api_key:
-            resend.api_key = self.api_key
+        self.api_url = getattr(settings, 'RESEND_API_URL', 'https://api.resend.com').rstrip('/')
+        self.timeout = getattr(settings, 'RESEND_TIMEOUT', 10)
+        self.max_retries = getattr(settings, 'RESEND_MAX_RETRIES', 3)
+        self.retry_backoff = getattr(settings, 'RESEND_RETRY_BACKOFF', 0.5)
 
     def send_messages(self, email_messages):
         """
@@ -31,51 +82,114 @@ class ResendEmailBackend(BaseEmailBackend):
                 raise ValueError("Resend API key not configured")
             return 0
 
+        email_messages = list(email_messages)
         sent_count = 0
-        
-        for message in email_messages:
+
+        for start in range(0, len(email_messages), self.BATCH_SIZE):
+            batch = email_messages[start:start + self.BATCH_SIZE]
             try:
-                # Prepare email data for Resend
-                email_data = {
-                    "from": message.from_email or settings.DEFAULT_FROM_EMAIL,
-                    "to": message.to,
-                    "subject": message.subject,
-                }
-                
-                # Handle HTML and text content
-                if hasattr(message, 'alternatives') and message.alternatives:
-                    for content, content_type in message.alternatives:
-                        if content_type == 'text/html':
-                            email_data["html"] = content
-                            break
-                    email_data["text"] = message.body
-                else:
-                    email_data["text"] = message.body
-                
-                # Add CC and BCC if present
-                if message.cc:
-                    email_data["cc"] = message.cc
-                if message.bcc:
-                    email_data["bcc"] = message.bcc
-                
-                # Add reply-to if present
-                if message.reply_to:
-                    email_data["reply_to"] = message.reply_to
-                
-                # Send email
-                response = resend.Emails.send(email_data)
-                
-                if response.get('id'):
-                    sent_count += 1
-                    logger.info(f"Email sent successfully: {response['id']}")
+                payloads = [self._build_payload(message) for message in batch]
+
+                idempotency_key = self._idempotency_key(batch)
+
+                if len(payloads) == 1:
+                    response = self._post('/emails', payloads[0], idempotency_key)
+                    ids = [response.get('id')]
                 else:
+                    response = self._post('/emails/batch', payloads, idempotency_key)
+                    ids = [item.get('id') for item in response.get('data', [])]
+
+                sent_ids = [email_id for email_id in ids if email_id]
+                sent_count += len(sent_ids)
+                if sent_ids:
+                    logger.info(f"Email sent successfully: {', '.join(sent_ids)}")
+                if len(sent_ids) != len(batch):
                     logger.error(f"Failed to send email: {response}")
                     if not self.fail_silently:
-                        raise Exception(f"Failed to send email: {response}")
-                        
+                        raise ResendAPIError(f"Failed to send email: {response}")
+
             except Exception as e:
                 logger.error(f"Error sending email: {str(e)}")
                 if not self.fail_silently:
                     raise e
-        
-        return sent_count
\ No newline at end of file
+
+        return sent_count
+
+    def _build_payload(self, message):
+        """
+        Convert an EmailMessage into a Resend API payload.
+        """
+        email_data = {
+            "from": message.from_email or settings.DEFAULT_FROM_EMAIL,
+            "to": message.to,
+            "subject": message.subject,
+        }
+
+        # Handle HTML and text content
+        if hasattr(message, 'alternatives') and message.alternatives:
+            for content, content_type in message.alternatives:
+                if content_type == 'text/html':
+                    email_data["html"] = content
+                    break
+        email_data["text"] = message.body
+
+        # Add CC and BCC if present
+        if message.cc:
+            email_data["cc"] = message.cc
+        if message.bcc:
+            email_data["bcc"] = message.bcc
+
+        # Add reply-to if present
+        if message.reply_to:
+            email_data["reply_to"] = message.reply_to
+
+        return email_data
+
+    def _idempotency_key(self, messages):
+        """
+        Return the Resend idempotency key for a request sending ``messages``.
+        """
+        keys = [message.extra_headers.get(IDEMPOTENCY_HEADER) for message in messages]
+        if not all(keys):
+            return str(uuid.uuid4())
+        if len(keys) == 1:
+            return keys[0]
+        digest = hashlib.sha256('\n'.join(keys).encode()).hexdigest()
+        return f'batch:{digest}'
+
+    def _post(self, path, payload, idempotency_key):
+        """
+        POST to the Resend API, retrying transient failures with backoff.
+        """
+        session = get_resend_session()
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Idempotency-Key': idempotency_key,
+        }
+        url = f'{self.api_url}{path}'
+
+        for attempt in range(self.max_retries + 1):
+            delay = self.retry_backoff * (2 ** attempt)
+            try:
+                response = session.post(url, json=payload, headers=headers, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt == self.max_retries:
+                    raise ResendAPIError(f"Resend request failed: {str(e)}")
+                logger.warning(f"Resend request failed, retrying in {delay}s: {str(e)}")
+                time.sleep(delay)
+                continue
+
+            if response.status_code in self.RETRY_STATUS_CODES and attempt < self.max_retries:
+                retry_after = response.headers.get('Retry-After')
+                if retry_after and retry_after.isdigit():
+                    delay = max(delay, int(retry_after))
+                logger.warning(f"Resend returned {response.status_code}, retrying in {delay}s")
+                time.sleep(delay)
+                continue
+
+            if response.status_code >= 400:
+                raise ResendAPIError(
+                    f"Resend returned {response.status_code}: {response.text}",
+                    status_code=response.status_code,
+                )
+            return response.json()
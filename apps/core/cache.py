@@ -0,0 +1,306 @@
+"""
+Caching helpers for New Revolution.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models.signals import post_save, post_delete
+from django.utils.cache import patch_cache_control
+from django.utils.http import http_date, parse_http_date_safe
+from rest_framework import status
+from rest_framework.response import Response
+
+
+class LocalLRUCache:
+    """
+    Small thread-safe in-process LRU cache with per-entry expiry.
+    """
+
+    def __init__(self, maxsize=128):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return default
+            value, expires_at = item
+            if expires_at is not None and expires_at < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value, timeout=None):
+        expires_at = time.monotonic() + timeout if timeout else None
+        with self._lock:
+            self._data[key] = (value, expires_at)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalLRUCache(maxsize=getattr(settings, 'CATALOG_LOCAL_CACHE_SIZE', 128))
+
+
+def _version_key(model):
+    return f'catalog:version:{model._meta.label_lower}'
+
+
+def get_model_version(model):
+    """
+    Return the current cache version of a model.
+
+    The version lives in the shared cache and is mirrored in-process for
+    ``CATALOG_VERSION_TTL`` seconds, so most reads need no round trip.
+    """
+    key = _version_key(model)
+    version = local_cache.get(key)
+    if version is None:
+        version = cache.get(key)
+        if version is None:
+            # Start from a timestamp so a flushed cache never reuses old versions
+            cache.add(key, time.time_ns(), None)
+            version = cache.get(key)
+        local_cache.set(key, version, getattr(settings, 'CATALOG_VERSION_TTL', 5))
+    return version
+
+
+def bump_model_version(model):
+    """
+    Invalidate every cached catalog entry built from ``model``.
+    """
+    key = _version_key(model)
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.set(key, time.time_ns(), None)
+    local_cache.delete(key)
+
+
+def _bump_on_change(sender, **kwargs):
+    bump_model_version(sender)
+
+
+def track_model_version(model):
+    """
+    Bump ``model``'s cache version whenever one of its rows is saved or deleted.
+    """
+    post_save.connect(_bump_on_change, sender=model, dispatch_uid=f'catalog-save-{model._meta.label_lower}')
+    post_delete.connect(_bump_on_change, sender=model, dispatch_uid=f'catalog-delete-{model._meta.label_lower}')
+
+
+class CachedCatalogMixin:
+    """
+    Read-through cache for list views over small reference tables.
+
+    Responses are cached in-process and in the shared cache, keyed by the
+    versions of ``catalog_models`` and the query string. Clients and CDNs
+    get an ``ETag`` and ``Cache-Control`` header, and a matching
+    ``If-None-Match`` is answered with 304 before any data is loaded.
+    Register the models with ``track_model_version`` so saves and deletes
+    invalidate the cache.
+    """
+    catalog_models = ()
+    catalog_timeout = 300
+    catalog_max_age = 60
+
+    def get_catalog_key(self, request):
+        versions = '.'.join(str(get_model_version(model)) for model in self.catalog_models)
+        query = request.GET.urlencode()
+        digest = hashlib.md5(f'{request.get_host()}{request.path}?{query}'.encode()).hexdigest()
+        return f'catalog:{digest}:{versions}'
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_catalog_key(request)
+        etag = f'"{hashlib.md5(key.encode()).hexdigest()}"'
+
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            data = local_cache.get(key)
+            if data is None:
+                data = cache.get(key)
+                if data is None:
+                    data = super().list(request, *args, **kwargs).data
+                    cache.set(key, data, self.catalog_timeout)
+                local_cache.set(key, data, self.catalog_timeout)
+            response = Response(data)
+
+        response['ETag'] = etag
+        patch_cache_control(response, public=True, max_age=self.catalog_max_age)
+        return response
+
+
+def _object_tag(model, pk):
+    return f'respcache:obj:{model._meta.label_lower}:{pk}'
+
+
+def bump_object_version(model, pk):
+    """
+    Invalidate cached responses that contain the given object.
+    """
+    bump_object_versions(model, [pk])
+
+
+def bump_object_versions(model, pks):
+    """
+    Invalidate cached responses that contain any of the given objects.
+    """
+    version = time.time_ns()
+    cache.set_many({_object_tag(model, pk): version for pk in pks}, 24 * 60 * 60)
+
+
+class CachedListMixin:
+    """
+    Short-lived response cache for public list views.
+
+    Responses are keyed on the host, path and normalized query parameters,
+    plus the user when ``response_cache_per_user`` is set (for serializers
+    with per-user fields). Each entry records the versions of the objects
+    it contains; ``bump_object_version`` makes entries holding a changed
+    object stale. Recomputation is single-flight: one request rebuilds a
+    stale entry while the others keep serving the previous copy, or wait
+    up to ``response_cache_wait`` seconds when there is none before
+    building the response themselves.
+    """
+    response_cache_timeout = 30
+    response_cache_stale_timeout = 30
+    response_cache_lock_timeout = 10
+    response_cache_wait = 1
+    response_cache_per_user = False
+
+    def get_response_cache_key(self, request):
+        params = sorted(
+            (key, value) for key in request.GET for value in request.GET.getlist(key)
+        )
+        parts = [request.get_host(), request.path, urlencode(params)]
+        if self.response_cache_per_user and request.user.is_authenticated:
+            parts.append(str(request.user.pk))
+        return 'respcache:' + hashlib.md5('|'.join(parts).encode()).hexdigest()
+
+    def get_response_cache_tags(self, data):
+        items = data.get('results', []) if isinstance(data, dict) else data
+        model = self.get_queryset().model
+        return [_object_tag(model, item['id']) for item in items if 'id' in item]
+
+    def _is_fresh(self, entry):
+        if entry['fresh_until'] < time.time():
+            return False
+        tags = entry['tags']
+        if not tags:
+            return True
+        current = cache.get_many(list(tags))
+        return all(current.get(tag) == version for tag, version in tags.items())
+
+    def _build_entry(self, request, *args, **kwargs):
+        data = super().list(request, *args, **kwargs).data
+        tags = self.get_response_cache_tags(data)
+        versions = cache.get_many(tags)
+        return {
+            'data': data,
+            'fresh_until': time.time() + self.response_cache_timeout,
+            'tags': {tag: versions.get(tag) for tag in tags},
+        }
+
+    def list(self, request, *args, **kwargs):
+        key = self.get_response_cache_key(request)
+        entry = cache.get(key)
+        if entry is not None and self._is_fresh(entry):
+            return Response(entry['data'])
+
+        lock_key = f'{key}:lock'
+        if cache.add(lock_key, 1, self.response_cache_lock_timeout):
+            try:
+                entry = self._build_entry(request, *args, **kwargs)
+                cache.set(
+                    key, entry,
+                    self.response_cache_timeout + self.response_cache_stale_timeout
+                )
+            finally:
+                cache.delete(lock_key)
+            return Response(entry['data'])
+
+        if entry is not None:
+            # Another request is rebuilding this entry
+            return Response(entry['data'])
+
+        # Waiting out a slow rebuild would tie up every worker
+        deadline = time.monotonic() + self.response_cache_wait
+        while time.monotonic() < deadline:
+            time.sleep(0.05)
+            entry = cache.get(key)
+            if entry is not None:
+                return Response(entry['data'])
+        return super().list(request, *args, **kwargs)
+
+
+class ConditionalRetrieveMixin:
+    """
+    Answer detail requests with 304 Not Modified when the client's copy is current.
+
+    Views implement ``get_conditional_validators``, which should use a cheap
+    query (no serialization) and return ``(etag_parts, last_modified)``, or
+    ``None`` when the object does not exist. ``last_modified`` may be
+    ``None`` when the body has content a timestamp cannot capture. Set
+    ``weak_etag`` when ``etag_parts`` deliberately leave out body content,
+    so the ETag is only semantically equivalent, not byte for byte.
+    """
+    weak_etag = False
+
+    def get_conditional_validators(self, request):
+        raise NotImplementedError
+
+    def not_modified(self, request, *args, **kwargs):
+        return Response(status=status.HTTP_304_NOT_MODIFIED)
+
+    def full_response(self, request, *args, **kwargs):
+        return super().retrieve(request, *args, **kwargs)
+
+    def _client_copy_is_current(self, request, etag, last_modified):
+        if_none_match = request.headers.get('If-None-Match')
+        if if_none_match:
+            # If-None-Match uses the weak comparison, ignoring W/ prefixes
+            tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+            return '*' in tags or etag.removeprefix('W/') in tags
+        if_modified_since = request.headers.get('If-Modified-Since')
+        if if_modified_since and last_modified:
+            since = parse_http_date_safe(if_modified_since)
+            return since is not None and int(last_modified.timestamp()) <= since
+        return False
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_conditional_validators(request)
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+
+        etag_parts, last_modified = validators
+        etag = '{}"{}"'.format(
+            'W/' if self.weak_etag else '',
+            hashlib.md5('|'.join(str(part) for part in etag_parts).encode()).hexdigest(),
+        )
+
+        if self._client_copy_is_current(request, etag, last_modified):
+            response = self.not_modified(request, *args, **kwargs)
+        else:
+            response = self.full_response(request, *args, **kwargs)
+
+        response['ETag'] = etag
+        if last_modified:
+            response['Last-Modified'] = http_date(last_modified.timestamp())
+        patch_cache_control(response, private=True, no_cache=True)
+        return response
@@ -0,0 +1,163 @@
+"""
+Dependency checks for the readiness probe.
+
+Every check bounds its own I/O by ``HEALTH_CHECK_TIMEOUT`` where the client
+allows it, so its thread finishes even when the dependency hangs.
+"""
+import asyncio
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.db import connection
+from django.utils import timezone
+
+try:
+    import redis
+    from django_redis.cache import RedisCache
+except ImportError:
+    redis = None
+
+
+def _timeout():
+    return getattr(settings, 'HEALTH_CHECK_TIMEOUT', 2)
+
+
+def check_database():
+    # Each probe runs checks on fresh threads, so close the thread's connection
+    try:
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute("SET statement_timeout = %s", [int(_timeout() * 1000)])
+            cursor.execute("SELECT 1")
+    finally:
+        connection.close()
+
+
+@functools.lru_cache(maxsize=None)
+def _redis_health_client():
+    """
+    Client for the Redis cache with the check's socket timeouts, or None.
+
+    The cache's own client has no socket timeout, so a hung server would
+    block the check indefinitely.
+    """
+    if redis is None or not isinstance(caches['default'], RedisCache):
+        return None
+    location = settings.CACHES['default']['LOCATION']
+    if isinstance(location, (list, tuple)):
+        location = location[0]
+    return redis.Redis.from_url(
+        location, socket_timeout=_timeout(), socket_connect_timeout=_timeout()
+    )
+
+
+def check_cache():
+    client = _redis_health_client()
+    if client is None:
+        cache.get('health:ping')
+    else:
+        client.ping()
+
+
+async def _channel_layer_round_trip(layer):
+    channel = await layer.new_channel()
+    await layer.send(channel, {'type': 'health.ping'})
+    await layer.receive(channel)
+
+
+async def _bounded_channel_layer_round_trip(layer):
+    await asyncio.wait_for(_channel_layer_round_trip(layer), _timeout())
+
+
+def check_channel_layer():
+    layer = get_channel_layer()
+    if layer is None:
+        return
+    async_to_sync(_bounded_channel_layer_round_trip)(layer)
+
+
+def check_broker():
+    from newrevolution.celery import app
+
+    with app.connection_for_write(connect_timeout=_timeout()) as conn:
+        conn.ensure_connection(max_retries=1)
+
+
+CHECKS = {
+    'database': check_database,
+    'cache': check_cache,
+    'channel_layer': check_channel_layer,
+    'broker': check_broker,
+}
+
+_lock = threading.Lock()
+# Latest future of each check, to spot checks still hung from earlier probes
+_running = {}
+_last_result = None
+_last_checked = 0.0
+
+
+def _timed(check):
+    started = time.perf_counter()
+    try:
+        check()
+    except Exception as e:
+        return {'status': 'error', 'error': str(e), 'latency_ms': _elapsed_ms(started)}
+    return {'status': 'ok', 'latency_ms': _elapsed_ms(started)}
+
+
+def _elapsed_ms(started):
+    return round((time.perf_counter() - started) * 1000, 2)
+
+
+def run_checks():
+    """
+    Run every check concurrently, each bounded by ``HEALTH_CHECK_TIMEOUT``.
+
+    Checks run on threads of their own, and the probe does not wait for
+    stragglers. A check still running from an earlier probe is reported as
+    timed out instead of being started again, so a hung dependency holds at
+    most one thread per check.
+    """
+    timeout = _timeout()
+    executor = ThreadPoolExecutor(max_workers=len(CHECKS), thread_name_prefix='health')
+    futures = {}
+    for name, check in CHECKS.items():
+        previous = _running.get(name)
+        if previous is None or previous.done():
+            futures[name] = _running[name] = executor.submit(_timed, check)
+    executor.shutdown(wait=False)
+    wait(futures.values(), timeout=timeout)
+
+    checks = {}
+    for name in CHECKS:
+        future = futures.get(name)
+        if future is not None and future.done():
+            checks[name] = future.result()
+        else:
+            checks[name] = {'status': 'timeout', 'latency_ms': timeout * 1000}
+    return {
+        'status': 'ready' if all(check['status'] == 'ok' for check in checks.values()) else 'unavailable',
+        'checked_at': timezone.now().isoformat(),
+        'checks': checks,
+    }
+
+
+def get_readiness():
+    """
+    Return the latest readiness result, re-running checks at most once
+    every ``HEALTH_CHECK_CACHE_SECONDS`` per process.
+    """
+    global _last_result, _last_checked
+
+    max_age = getattr(settings, 'HEALTH_CHECK_CACHE_SECONDS', 5)
+    with _lock:
+        if _last_result is None or time.monotonic() - _last_checked >= max_age:
+            _last_result = run_checks()
+            _last_checked = time.monotonic()
+        return _last_result
\ No newline at end of file
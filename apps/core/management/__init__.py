@@ -0,0 +1 @@
+# Core management
\ No newline at end of file
@@ -0,0 +1 @@
+# Core management commands
\ No newline at end of file
@@ -0,0 +1,384 @@
+"""
+Benchmark the marketplace API against a seeded database.
+
+Run ``seed_marketplace`` first. Each scenario is driven in-process through
+the Django test client (and the chat consumer through a channels
+communicator), so results reflect application and database time without
+network or server overhead. The report is JSON so runs can be compared
+across commits.
+"""
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from unittest import mock
+from asgiref.sync import async_to_sync
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import Count
+from django.template.loader import render_to_string
+from django.test import Client
+from django.utils.http import urlencode
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from apps.accounts.models import User
+from apps.accounts.tokens import tokens_for_user
+from apps.categories.models import Category
+from apps.chat.models import Conversation, Message
+from apps.chat.routing import websocket_urlpatterns
+from apps.chat.serializers import ConversationSerializer, MessageValuesSerializer
+from apps.chat.views import _user_conversations
+from apps.core.metrics import QueryCounter
+from apps.core.renderers import ORJSONRenderer
+from apps.core.throttling import GCRAThrottle
+from apps.core.utils import _email_base_context, bulk_render_notification_emails
+from apps.products.models import Product
+from apps.products.serializers import ProductListSerializer, ProductListValuesSerializer
+
+# Resizes one image in a fresh interpreter and prints the peak resident set
+# size before and after, and the time taken. Peak RSS includes Pillow's
+# C-level buffers, which tracemalloc does not see.
+RSS_PROBE = """
+import resource
+import sys
+import time
+import django
+
+django.setup()
+from PIL import Image
+from apps.core.utils import resize_image
+
+path, mode = sys.argv[1:3]
+with open(path, 'rb') as f:
+    before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    started = time.perf_counter()
+    if mode == 'resize_image':
+        resize_image(f)
+    else:
+        image = Image.open(f)
+        image.load()
+        image.resize((1200, 900), Image.Resampling.LANCZOS)
+    elapsed = time.perf_counter() - started
+    after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(before, after, elapsed)
+"""
+
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))
+    return ordered[index]
+
+
+def summarize(latencies, queries=None):
+    """Summarize latencies (seconds) as milliseconds, with query counts."""
+    ms = [latency * 1000 for latency in latencies]
+    summary = {
+        'runs': len(ms),
+        'mean_ms': round(statistics.fmean(ms), 3),
+        'p50_ms': round(percentile(ms, 50), 3),
+        'p95_ms': round(percentile(ms, 95), 3),
+        'p99_ms': round(percentile(ms, 99), 3),
+        'max_ms': round(max(ms), 3),
+    }
+    if queries is not None:
+        summary['queries_mean'] = round(statistics.fmean(queries), 2)
+        summary['queries_max'] = max(queries)
+    return summary
+
+
+class Command(BaseCommand):
+    help = 'Benchmark key API endpoints and chat, reporting latency percentiles as JSON.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=200,
+                            help='Measured requests per scenario.')
+        parser.add_argument('--warmup', type=int, default=10,
+                            help='Unmeasured requests per scenario.')
+        parser.add_argument('--cold-cache', action='store_true',
+                            help='Clear the cache before every request.')
+        parser.add_argument('--ws-messages', type=int, default=100)
+        parser.add_argument('--email-recipients', type=int, default=10000)
+        parser.add_argument('--skip-micro', action='store_true',
+                            help='Only run the endpoint and WebSocket scenarios.')
+        parser.add_argument('--output', help='Write the JSON report to this file.')
+
+    def handle(self, *args, **options):
+        self.options = options
+        self.user = self.pick_user()
+
+        # Throttling would turn the benchmark into a rate limit test. Views
+        # bind their throttle classes at import, so overriding settings has
+        # no effect; the throttle itself is switched off instead.
+        with mock.patch.object(GCRAThrottle, 'allow_request', return_value=True):
+            results = {'endpoints': self.run_endpoints()}
+        results['websocket'] = self.run_websocket()
+        if not options['skip_micro']:
+            results['micro'] = {
+                'image_resize': self.bench_image_resize(),
+                'email_render': self.bench_email_render(),
+                'json_renderer': self.bench_renderers(),
+                'list_serializer': self.bench_list_serializers(),
+            }
+
+        report = json.dumps({
+            'meta': self.metadata(),
+            'results': results,
+        }, indent=2)
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                f.write(report)
+            self.stdout.write(self.style.SUCCESS(f"Report written to {options['output']}"))
+        else:
+            self.stdout.write(report)
+
+    def metadata(self):
+        try:
+            commit = subprocess.run(
+                ['git', 'rev-parse', '--short', 'HEAD'],
+                cwd=settings.BASE_DIR, capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            commit = None
+        return {
+            'commit': commit,
+            'python': platform.python_version(),
+            'database': connection.vendor,
+            'cache': settings.CACHES['default']['BACKEND'],
+            'iterations': self.options['iterations'],
+            'cold_cache': self.options['cold_cache'],
+            'products': Product.objects.count(),
+        }
+
+    def pick_user(self):
+        """The busiest chat participant, so inbox and messages have data."""
+        user = (
+            User.objects.filter(is_active=True, is_banned=False)
+            .annotate(conversation_count=Count('conversations'))
+            .order_by('-conversation_count')
+            .first()
+        )
+        if user is None:
+            raise CommandError('No users found, run seed_marketplace first.')
+        return user
+
+    def scenarios(self):
+        product = Product.objects.filter(is_active=True).order_by('-likes').first()
+        conversation = Conversation.objects.filter(participants=self.user).first()
+        category = Category.objects.filter(parent__isnull=False).first()
+        if product is None:
+            raise CommandError('No products found, run seed_marketplace first.')
+
+        product_list = reverse('products:product-list-create')
+        search = urlencode({'search': product.title.split()[0].lower()})
+        scenarios = {
+            'product_list': product_list,
+            'product_search': f'{product_list}?{search}',
+            'product_detail': reverse('products:product-detail', args=[product.pk]),
+            'product_trending': reverse('products:trending-products'),
+            'category_tree': reverse('categories:category-tree'),
+            'notifications': reverse('notifications:notification-list'),
+            'inbox': reverse('chat:conversation-list-create'),
+        }
+        if category is not None:
+            scenarios['product_list_by_category'] = (
+                f"{product_list}?{urlencode({'category': category.name})}"
+            )
+        if conversation is not None:
+            scenarios['message_list'] = reverse('chat:message-list-create', args=[conversation.pk])
+        return scenarios
+
+    def run_endpoints(self):
+        access = str(tokens_for_user(self.user).access_token)
+        client = Client(HTTP_AUTHORIZATION=f'Bearer {access}', SERVER_NAME='localhost')
+
+        results = {}
+        for name, url in self.scenarios().items():
+            for _ in range(self.options['warmup']):
+                client.get(url)
+
+            latencies, queries, statuses = [], [], set()
+            for _ in range(self.options['iterations']):
+                if self.options['cold_cache']:
+                    cache.clear()
+                counter = QueryCounter()
+                started = time.perf_counter()
+                with connection.execute_wrapper(counter):
+                    response = client.get(url)
+                latencies.append(time.perf_counter() - started)
+                queries.append(counter.count)
+                statuses.add(response.status_code)
+
+            results[name] = dict(summarize(latencies, queries), url=url, status=sorted(statuses))
+            self.stderr.write(f"{name}: p95 {results[name]['p95_ms']} ms")
+        return results
+
+    def run_websocket(self):
+        conversation = Conversation.objects.filter(participants=self.user).first()
+        if conversation is None:
+            return {'skipped': 'the benchmark user has no conversations'}
+        return async_to_sync(self._websocket_round_trips)(conversation)
+
+    async def _websocket_round_trips(self, conversation):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f'/ws/chat/{conversation.pk}/'
+        )
+        communicator.scope['user'] = self.user
+
+        started = time.perf_counter()
+        connected, _ = await communicator.connect()
+        connect_time = time.perf_counter() - started
+        if not connected:
+            return {'skipped': 'connection refused'}
+
+        latencies = []
+        try:
+            for i in range(self.options['ws_messages']):
+                started = time.perf_counter()
+                await communicator.send_json_to({'message': f'benchmark {i}'})
+                await communicator.receive_json_from(timeout=5)
+                latencies.append(time.perf_counter() - started)
+        finally:
+            await communicator.disconnect()
+
+        return dict(summarize(latencies), connect_ms=round(connect_time * 1000, 3))
+
+    def _probe_image_resize(self, path, mode):
+        """Run ``RSS_PROBE`` and return ``(peak_rss_growth_bytes, seconds)``."""
+        env = dict(os.environ)
+        env.setdefault('DJANGO_SETTINGS_MODULE', settings.SETTINGS_MODULE)
+        output = subprocess.run(
+            [sys.executable, '-c', RSS_PROBE, path, mode],
+            cwd=settings.BASE_DIR, env=env, capture_output=True, text=True, check=True,
+        ).stdout.split()
+        before, after, elapsed = int(output[0]), int(output[1]), float(output[2])
+        # ru_maxrss is in bytes on macOS and kilobytes elsewhere
+        unit = 1 if sys.platform == 'darwin' else 1024
+        return (after - before) * unit, elapsed
+
+    def bench_image_resize(self):
+        """
+        Peak RSS growth and time of resizing a 12 megapixel JPEG.
+
+        Each run uses a fresh subprocess, since peak RSS never goes down.
+        ``resize_image`` is compared with decoding the full image first.
+        """
+        from PIL import Image
+
+        with tempfile.NamedTemporaryFile(suffix='.jpg') as source:
+            Image.new('RGB', (4000, 3000), (120, 80, 40)).save(source, format='JPEG', quality=90)
+            source.flush()
+
+            results = {}
+            for mode in ('resize_image', 'full_decode'):
+                latencies, peaks = [], []
+                for _ in range(5):
+                    peak, elapsed = self._probe_image_resize(source.name, mode)
+                    peaks.append(peak)
+                    latencies.append(elapsed)
+                results[mode] = dict(
+                    summarize(latencies), peak_rss_growth_mb=round(max(peaks) / 2 ** 20, 2)
+                )
+        return results
+
+    def bench_email_render(self):
+        """Bulk rendering against one render_to_string call per recipient."""
+        template = 'seller_welcome'
+        recipients = [
+            User(username=f'user{i}', first_name=f'User{i}', email=f'user{i}@example.com')
+            for i in range(self.options['email_recipients'])
+        ]
+
+        started = time.perf_counter()
+        for _ in bulk_render_notification_emails(template, ((user, None) for user in recipients)):
+            pass
+        bulk = time.perf_counter() - started
+
+        base = _email_base_context()
+        started = time.perf_counter()
+        for user in recipients:
+            context = dict(base, user=user)
+            render_to_string(f'emails/{template}.html', context)
+            render_to_string(f'emails/{template}.txt', context)
+        per_user = time.perf_counter() - started
+
+        return {
+            'recipients': len(recipients),
+            'bulk_s': round(bulk, 3),
+            'per_user_s': round(per_user, 3),
+            'speedup': round(per_user / bulk, 2),
+        }
+
+    def _product_page_rows(self):
+        serializer = ProductListValuesSerializer()
+        rows = list(Product.objects.filter(is_active=True).values_list(*serializer.lookups)[:100])
+        return serializer, rows
+
+    def _render_payloads(self):
+        """One page each of products, chat messages and conversations."""
+        def page(results):
+            return {'count': len(results), 'next': None, 'previous': None, 'results': results}
+
+        serializer, rows = self._product_page_rows()
+        payloads = {'product_page': page(serializer.serialize(rows))}
+
+        message_serializer = MessageValuesSerializer()
+        messages = list(
+            Message.objects.filter(conversation__participants=self.user)
+            .order_by('-created_at')
+            .values_list(*message_serializer.lookups)[:100]
+        )
+        payloads['message_page'] = page(message_serializer.serialize(messages))
+
+        conversations = list(_user_conversations(self.user).distinct()[:100])
+        payloads['conversation_page'] = page(
+            ConversationSerializer(conversations, many=True).data
+        )
+        return payloads
+
+    def bench_renderers(self):
+        """Render product, message and conversation pages with orjson and DRF."""
+        results = {}
+        for payload, data in self._render_payloads().items():
+            results[payload] = {'rows': len(data['results'])}
+            for name, renderer in (('orjson', ORJSONRenderer()), ('drf', JSONRenderer())):
+                latencies = []
+                for _ in range(self.options['iterations']):
+                    started = time.perf_counter()
+                    renderer.render(data, 'application/json', {})
+                    latencies.append(time.perf_counter() - started)
+                results[payload][name] = summarize(latencies)
+        return results
+
+    def bench_list_serializers(self):
+        """Rows per second of the values fast path and the ModelSerializer."""
+        serializer, rows = self._product_page_rows()
+        products = list(
+            Product.objects.filter(is_active=True)
+            .select_related('seller', 'category')
+            .prefetch_related('images')[:100]
+        )
+
+        started = time.perf_counter()
+        for _ in range(20):
+            serializer.serialize(rows)
+        values_elapsed = time.perf_counter() - started
+
+        started = time.perf_counter()
+        for _ in range(20):
+            ProductListSerializer(products, many=True).data
+        model_elapsed = time.perf_counter() - started
+
+        return {
+            'rows': len(rows),
+            'values_rows_per_s': round(20 * len(rows) / values_elapsed),
+            'model_rows_per_s': round(20 * len(products) / model_elapsed),
+        }
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Seed the database with a synthetic marketplace for load tests and benchmarks.
+"""
+import random
+import uuid
+from datetime import timedelta
+from decimal import Decimal
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from taggit.models import Tag
+from apps.accounts.models import User, UserProfile
+from apps.categories.models import Category
+from apps.chat.models import Conversation, Message
+from apps.notifications.models import Notification
+from apps.products.models import (
+    BoostExpiry, Product, ProductImage, ProductLike, ProductTaggedItem,
+)
+from apps.products.tags import recount_tag_usage
+from apps.reviews.models import Review
+
+WORDS = (
+    'vintage', 'classic', 'modern', 'compact', 'wireless', 'leather', 'wooden',
+    'electric', 'portable', 'premium', 'handmade', 'rare', 'smart', 'outdoor',
+    'bike', 'camera', 'guitar', 'lamp', 'jacket', 'phone', 'desk', 'chair',
+    'watch', 'speaker', 'console', 'sofa', 'tent', 'drone', 'printer', 'kettle',
+)
+
+
+class Command(BaseCommand):
+    help = 'Seed a synthetic marketplace dataset with bulk inserts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--root-categories', type=int, default=10)
+        parser.add_argument('--child-categories', type=int, default=5,
+                            help='Subcategories per root category.')
+        parser.add_argument('--products', type=int, default=10000)
+        parser.add_argument('--images-per-product', type=int, default=3)
+        parser.add_argument('--tags', type=int, default=300)
+        parser.add_argument('--tags-per-product', type=int, default=3)
+        parser.add_argument('--likes', type=int, default=30000)
+        parser.add_argument('--reviews', type=int, default=5000)
+        parser.add_argument('--conversations', type=int, default=2000)
+        parser.add_argument('--messages-per-conversation', type=int, default=20)
+        parser.add_argument('--notifications', type=int, default=30000)
+        parser.add_argument('--batch-size', type=int, default=2000)
+        parser.add_argument('--password', default='benchmark',
+                            help='Password of every seeded user.')
+        parser.add_argument('--seed', type=int, default=42, help='Random seed.')
+
+    def handle(self, *args, **options):
+        self.random = random.Random(options['seed'])
+        self.batch_size = options['batch_size']
+        # Usernames and category slugs must not clash with earlier runs
+        self.run_id = uuid.uuid4().hex[:8]
+
+        with transaction.atomic():
+            users = self.seed_users(options['users'], options['password'])
+            categories = self.seed_categories(
+                options['root_categories'], options['child_categories']
+            )
+            products = self.seed_products(options['products'], users, categories)
+            self.seed_images(products, options['images_per_product'])
+            self.seed_tags(products, options['tags'], options['tags_per_product'])
+            self.seed_likes(products, users, options['likes'])
+            self.seed_reviews(products, users, options['reviews'])
+            conversations = self.seed_conversations(
+                products, users, options['conversations'],
+                options['messages_per_conversation'],
+            )
+            self.seed_notifications(users, products, conversations, options['notifications'])
+
+        # Tag links were bulk inserted without updating usage counters
+        recount_tag_usage()
+        self.stdout.write(self.style.SUCCESS(f'Seeded run {self.run_id}'))
+
+    def bulk_create(self, model, objects):
+        created = model.objects.bulk_create(objects, batch_size=self.batch_size)
+        self.stdout.write(f'  {model._meta.verbose_name_plural}: {len(created)}')
+        return created
+
+    def words(self, count):
+        return ' '.join(self.random.choice(WORDS) for _ in range(count))
+
+    def seed_users(self, count, password):
+        password_hash = make_password(password)
+        users = [
+            User(
+                username=f'{self.run_id}_user{i}',
+                email=f'{self.run_id}_user{i}@example.com',
+                first_name=self.words(1).title(),
+                last_name=self.words(1).title(),
+                password=password_hash,
+                is_verified=True,
+                is_seller=i % 3 == 0,
+            )
+            for i in range(count)
+        ]
+        users = self.bulk_create(User, users)
+        # bulk_create skips the post_save signal that creates profiles
+        self.bulk_create(UserProfile, [UserProfile(user=user) for user in users])
+        return users
+
+    def seed_categories(self, roots, children_per_root):
+        with Category.objects.disable_mptt_updates():
+            parents = [
+                Category(
+                    name=f'{self.words(1).title()} {self.run_id} {i}',
+                    slug=f'{self.run_id}-root-{i}',
+                    order=i, lft=0, rght=0, tree_id=0, level=0,
+                )
+                for i in range(roots)
+            ]
+            Category.objects.bulk_create(parents)
+            children = [
+                Category(
+                    name=f'{parent.name} {j}',
+                    slug=f'{parent.slug}-{j}',
+                    parent=parent, order=j, lft=0, rght=0, tree_id=0, level=0,
+                )
+                for parent in parents
+                for j in range(children_per_root)
+            ]
+            Category.objects.bulk_create(children)
+        Category.objects.rebuild()
+        self.stdout.write(f'  categories: {len(parents) + len(children)}')
+        return children or parents
+
+    def seed_products(self, count, users, categories):
+        sellers = [user for user in users if user.is_seller] or users
+        now = timezone.now()
+        products = []
+        for _ in range(count):
+            is_boosted = self.random.random() < 0.05
+            products.append(Product(
+                title=self.words(3).title(),
+                description=self.words(40),
+                price=Decimal(self.random.randint(100, 500000)) / 100,
+                condition=self.random.choice(('new', 'used', 'refurbished')),
+                category=self.random.choice(categories),
+                seller=self.random.choice(sellers),
+                location=self.words(1).title(),
+                is_featured=self.random.random() < 0.05,
+                is_boosted=is_boosted,
+                boost_expires_at=now + timedelta(days=7) if is_boosted else None,
+                views=self.random.randint(0, 5000),
+            ))
+        products = self.bulk_create(Product, products)
+        # bulk_create skips the post_save signal that queues boost expiries
+        self.bulk_create(BoostExpiry, [
+            BoostExpiry(
+                product=product,
+                expires_at=product.boost_expires_at,
+                bucket=BoostExpiry.bucket_for(product.boost_expires_at),
+            )
+            for product in products if product.is_boosted
+        ])
+        return products
+
+    def seed_images(self, products, per_product):
+        images = [
+            ProductImage(
+                product=product,
+                image=f'products/seed/{product.pk}_{order}.jpg',
+                alt_text=product.title,
+                order=order,
+            )
+            for product in products
+            for order in range(per_product)
+        ]
+        self.bulk_create(ProductImage, images)
+
+    def seed_tags(self, products, count, per_product):
+        names = sorted({self.words(2) for _ in range(count * 3)})[:count]
+        existing = set(Tag.objects.filter(name__in=names).values_list('name', flat=True))
+        Tag.objects.bulk_create([
+            Tag(name=name, slug=slugify(name)) for name in names if name not in existing
+        ], batch_size=self.batch_size)
+        tags = list(Tag.objects.filter(name__in=names))
+        if not tags:
+            return
+
+        content_type = ContentType.objects.get_for_model(Product)
+        items = [
+            ProductTaggedItem(content_type=content_type, object_id=product.pk, tag=tag)
+            for product in products
+            for tag in self.random.sample(tags, min(per_product, len(tags)))
+        ]
+        self.bulk_create(ProductTaggedItem, items)
+
+    def seed_likes(self, products, users, count):
+        pairs = set()
+        for _ in range(count):
+            pairs.add((self.random.randrange(len(products)), self.random.randrange(len(users))))
+        likes = [ProductLike(product=products[p], user=users[u]) for p, u in pairs]
+        self.bulk_create(ProductLike, likes)
+
+        like_counts = {}
+        for p, _ in pairs:
+            like_counts[p] = like_counts.get(p, 0) + 1
+        for p, likes in like_counts.items():
+            products[p].likes = likes
+        Product.objects.bulk_update(
+            [products[p] for p in like_counts], ['likes'], batch_size=self.batch_size
+        )
+
+    def seed_reviews(self, products, users, count):
+        pairs = set()
+        for _ in range(count):
+            pairs.add((self.random.randrange(len(products)), self.random.randrange(len(users))))
+        reviews = [
+            Review(
+                product=products[p],
+                reviewer=users[u],
+                seller_id=products[p].seller_id,
+                rating=self.random.randint(1, 5),
+                title=self.words(3).capitalize(),
+                comment=self.words(25),
+            )
+            for p, u in pairs
+        ]
+        self.bulk_create(Review, reviews)
+
+    def seed_conversations(self, products, users, count, messages_per_conversation):
+        conversations = self.bulk_create(Conversation, [
+            Conversation(product=self.random.choice(products)) for _ in range(count)
+        ])
+
+        Participant = Conversation.participants.through
+        participants = []
+        senders = {}
+        for conversation in conversations:
+            buyer = self.random.choice(users)
+            seller_id = conversation.product.seller_id
+            senders[conversation.pk] = (buyer.pk, seller_id)
+            participants.append(Participant(conversation_id=conversation.pk, user_id=buyer.pk))
+            if seller_id != buyer.pk:
+                participants.append(Participant(conversation_id=conversation.pk, user_id=seller_id))
+        Participant.objects.bulk_create(participants, batch_size=self.batch_size)
+
+        messages = [
+            Message(
+                conversation=conversation,
+                sender_id=senders[conversation.pk][i % 2],
+                content=self.words(12).capitalize(),
+                is_read=self.random.random() < 0.7,
+            )
+            for conversation in conversations
+            for i in range(messages_per_conversation)
+        ]
+        self.bulk_create(Message, messages)
+        return conversations
+
+    def seed_notifications(self, users, products, conversations, count):
+        notifications = []
+        for _ in range(count):
+            notification_type = self.random.choice(('message', 'product_like', 'review', 'system'))
+            notifications.append(Notification(
+                recipient=self.random.choice(users),
+                sender=self.random.choice(users),
+                notification_type=notification_type,
+                title=self.words(4).capitalize(),
+                message=self.words(15),
+                is_read=self.random.random() < 0.5,
+                product=self.random.choice(products) if notification_type != 'system' else None,
+                conversation=(
+                    self.random.choice(conversations)
+                    if notification_type == 'message' and conversations else None
+                ),
+            ))
+        self.bulk_create(Notification, notifications)
\ No newline at end of file
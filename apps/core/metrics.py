@@ -0,0 +1,202 @@
+"""
+Prometheus metrics for New Revolution.
+
+Metrics are only recorded when ``prometheus_client`` is installed; the
+helpers below are no-ops otherwise. Labels are limited to the URL name,
+HTTP method and status class so the number of series stays bounded. Set
+``PROMETHEUS_MULTIPROC_DIR`` when serving with several worker processes.
+"""
+import hmac
+import ipaddress
+import os
+import time
+from django.conf import settings
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import connection
+from django.http import HttpResponse
+
+try:
+    import prometheus_client
+    from prometheus_client import Counter, Gauge, Histogram
+except ImportError:
+    prometheus_client = None
+
+try:
+    from django_redis.cache import RedisCache
+except ImportError:
+    RedisCache = None
+
+METHODS = {'GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'}
+
+if prometheus_client is not None:
+    REQUEST_LATENCY = Histogram(
+        'http_request_duration_seconds', 'Request latency by view.',
+        ['view', 'method', 'status'],
+    )
+    REQUEST_QUERIES = Histogram(
+        'http_request_db_queries', 'Database queries per request.',
+        ['view'], buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+    )
+    REQUEST_QUERY_TIME = Histogram(
+        'http_request_db_seconds', 'Time spent in database queries per request.',
+        ['view'],
+    )
+    CACHE_REQUESTS = Counter(
+        'cache_requests', 'Cache lookups by result.', ['result'],
+    )
+    CHANNEL_PUBLISH_LATENCY = Histogram(
+        'channel_layer_publish_seconds', 'Channel layer group_send latency.',
+        buckets=(.001, .0025, .005, .01, .025, .05, .1, .25, .5, 1),
+    )
+    WEBSOCKET_CONNECTIONS = Gauge(
+        'websocket_connections', 'Open WebSocket connections.',
+        multiprocess_mode='livesum',
+    )
+
+
+def record_cache_lookups(hits, misses):
+    if prometheus_client is None:
+        return
+    if hits:
+        CACHE_REQUESTS.labels(result='hit').inc(hits)
+    if misses:
+        CACHE_REQUESTS.labels(result='miss').inc(misses)
+
+
+def observe_channel_publish(seconds):
+    if prometheus_client is not None:
+        CHANNEL_PUBLISH_LATENCY.observe(seconds)
+
+
+def websocket_opened():
+    if prometheus_client is not None:
+        WEBSOCKET_CONNECTIONS.inc()
+
+
+def websocket_closed():
+    if prometheus_client is not None:
+        WEBSOCKET_CONNECTIONS.dec()
+
+
+class QueryCounter:
+    """
+    ``connection.execute_wrapper`` hook counting queries and their duration.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.duration += time.perf_counter() - started
+
+
+def view_label(request):
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return '<unmatched>'
+    return match.view_name or match._func_path
+
+
+class MetricsMiddleware:
+    """
+    Record latency and database usage of every request.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if prometheus_client is None:
+            return self.get_response(request)
+
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with connection.execute_wrapper(queries):
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view = view_label(request)
+        method = request.method if request.method in METHODS else 'other'
+        REQUEST_LATENCY.labels(view, method, f'{response.status_code // 100}xx').observe(elapsed)
+        REQUEST_QUERIES.labels(view).observe(queries.count)
+        REQUEST_QUERY_TIME.labels(view).observe(queries.duration)
+        return response
+
+
+class CacheMetricsMixin:
+    """
+    Count cache hits and misses of ``get``.
+    """
+    _metrics_missing = object()
+
+    def get(self, key, default=None, version=None, **kwargs):
+        value = super().get(key, self._metrics_missing, version=version, **kwargs)
+        if value is self._metrics_missing:
+            record_cache_lookups(0, 1)
+            return default
+        record_cache_lookups(1, 0)
+        return value
+
+
+class InstrumentedLocMemCache(CacheMetricsMixin, LocMemCache):
+    # BaseCache.get_many goes through get(), so lookups are already counted
+    pass
+
+
+if RedisCache is not None:
+    class InstrumentedRedisCache(CacheMetricsMixin, RedisCache):
+
+        def get_many(self, keys, *args, **kwargs):
+            keys = list(keys)
+            values = super().get_many(keys, *args, **kwargs)
+            record_cache_lookups(len(values), len(keys) - len(values))
+            return values
+
+
+def _is_allowed_ip(address):
+    """Whether ``address`` is in one of the ``METRICS_ALLOWED_IPS`` networks."""
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(
+        ip in ipaddress.ip_network(network, strict=False)
+        for network in getattr(settings, 'METRICS_ALLOWED_IPS', [])
+    )
+
+
+def metrics_view(request):
+    """
+    Expose metrics in the Prometheus text format.
+
+    When ``METRICS_TOKEN`` is set, requests must send it as a bearer token.
+    Without a token only requests from ``METRICS_ALLOWED_IPS`` are served,
+    or every request when DEBUG is on.
+    """
+    token = getattr(settings, 'METRICS_TOKEN', '')
+    if token:
+        authorization = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(authorization.encode(), f'Bearer {token}'.encode()):
+            return HttpResponse(status=401)
+    elif not settings.DEBUG and not _is_allowed_ip(request.META.get('REMOTE_ADDR', '')):
+        return HttpResponse(status=404)
+    if prometheus_client is None:
+        return HttpResponse(status=404)
+
+    if os.environ.get('PROMETHEUS_MULTIPROC_DIR'):
+        from prometheus_client import CollectorRegistry, multiprocess
+
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = prometheus_client.REGISTRY
+    return HttpResponse(
+        prometheus_client.generate_latest(registry),
+        content_type=prometheus_client.CONTENT_TYPE_LATEST,
+    )
\ No newline at end of file
@@ -0,0 +1,22 @@
+"""
+Middleware for New Revolution.
+"""
+
+
+class RateLimitHeadersMiddleware:
+    """
+    Report the rate limit budget checked by ``GCRAThrottle`` in response headers.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        rate_limit = getattr(request, 'rate_limit', None)
+        if rate_limit is not None:
+            limit, remaining, reset = rate_limit
+            response['X-RateLimit-Limit'] = str(limit)
+            response['X-RateLimit-Remaining'] = str(remaining)
+            response['X-RateLimit-Reset'] = str(reset)
+        return response
\ No newline at end of file
@@ -1,8 +1,11 @@
 """
 Core models for the New Revolution marketplace.
 """
-from django.db import models
+from datetime import timedelta
+from django.conf import settings
+from django.db import models, transaction
 from django.utils import timezone
+from .signals import soft_deleted, restored
 import uuid
 
 
@@ -18,13 +21,108 @@ class TimeStampedModel(models.Model):
         abstract = True
 
 
+def _soft_delete_batch_size():
+    return getattr(settings, 'SOFT_DELETE_BATCH_SIZE', 1000)
+
+
+class LiveQuerySet(models.QuerySet):
+    """
+    QuerySet with set-based soft delete, for managers of live rows only.
+
+    Each operation works through the matching rows in batches of
+    ``SOFT_DELETE_BATCH_SIZE`` primary keys, one short statement per batch,
+    and returns the number of rows affected.
+    """
+
+    def _update_in_batches(self, queryset, signal, **values):
+        model = self.model
+        if any(field.name == 'updated_at' for field in model._meta.concrete_fields):
+            values['updated_at'] = timezone.now()
+
+        batch_size = _soft_delete_batch_size()
+        total = 0
+        while True:
+            # Updated rows drop out of ``queryset``, so each pass takes the next batch
+            pks = list(queryset.order_by().values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            total += model.all_objects.filter(pk__in=pks).update(**values)
+            signal.send(sender=model, pks=pks)
+            if len(pks) < batch_size:
+                break
+        return total
+
+    def soft_delete(self):
+        """Soft delete the selected rows."""
+        return self._update_in_batches(
+            self.filter(is_deleted=False), soft_deleted,
+            is_deleted=True, deleted_at=timezone.now(),
+        )
+
+
+class SoftDeleteQuerySet(LiveQuerySet):
+    """
+    QuerySet over live and deleted rows, adding restore and purge.
+
+    Only ``all_objects`` uses it: querysets of live rows never select a
+    deleted row, so there restore and purge would always affect nothing.
+    """
+
+    def restore(self):
+        """Restore the selected rows that were soft deleted."""
+        return self._update_in_batches(
+            self.filter(is_deleted=True), restored,
+            is_deleted=False, deleted_at=None,
+        )
+
+    def purge(self, older_than):
+        """
+        Permanently delete selected rows soft deleted before ``older_than``.
+
+        ``older_than`` is a datetime or a timedelta before now. Rows are
+        removed with ``QuerySet.delete``, so cascades and ``pre_delete``/
+        ``post_delete`` receivers still run.
+        """
+        if isinstance(older_than, timedelta):
+            older_than = timezone.now() - older_than
+
+        queryset = self.filter(is_deleted=True, deleted_at__lt=older_than).order_by()
+        batch_size = _soft_delete_batch_size()
+        total = 0
+        while True:
+            pks = list(queryset.values_list('pk', flat=True)[:batch_size])
+            if not pks:
+                break
+            with transaction.atomic():
+                deleted, _ = self.model.all_objects.filter(pk__in=pks).delete()
+            total += deleted
+            if len(pks) < batch_size:
+                break
+        return total
+
+
+class SoftDeleteManager(models.Manager.from_queryset(LiveQuerySet)):
+    """
+    Manager that only returns rows which have not been soft deleted.
+    """
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_deleted=False)
+
+
 class SoftDeleteModel(models.Model):
     """
     Abstract base model that provides soft delete functionality.
+
+    ``objects`` only sees live rows; use ``all_objects`` to reach deleted
+    ones (admin, recovery, maintenance tasks).
     """
     is_deleted = models.BooleanField(default=False)
     deleted_at = models.DateTimeField(null=True, blank=True)
 
+    objects = SoftDeleteManager()
+    all_objects = SoftDeleteQuerySet.as_manager()
+
     class Meta:
         abstract = True
 
@@ -33,6 +131,7 @@ class SoftDeleteModel(models.Model):
         self.is_deleted = True
         self.deleted_at = timezone.now()
         self.save(using=using)
+        soft_deleted.send(sender=self.__class__, pks=[self.pk])
 
     def hard_delete(self, using=None, keep_parents=False):
         """Permanently delete the object."""
@@ -43,6 +142,7 @@ class SoftDeleteModel(models.Model):
         self.is_deleted = False
         self.deleted_at = None
         self.save()
+        restored.send(sender=self.__class__, pks=[self.pk])
 
 
 class BaseModel(TimeStampedModel, SoftDeleteModel):
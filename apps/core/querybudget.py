@@ -0,0 +1,162 @@
+"""
+Query budgets for catching N+1 queries in development and CI.
+
+Views declare the most queries a request may run with ``query_budget``
+(function views use the ``query_budget`` decorator). In ``warn`` mode
+``QueryBudgetMiddleware`` logs requests that exceed their budget or repeat
+the same query, naming the serializer field (or application line) that
+ran it; in ``raise`` mode the request fails instead. Tests can wrap code
+in ``assert_query_budget``.
+"""
+import re
+import sys
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import connection
+from rest_framework.fields import Field
+import logging
+
+logger = logging.getLogger(__name__)
+
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+_APP_PATH = f'{settings.BASE_DIR}/apps/'
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+def normalize_sql(sql):
+    """Collapse variable-length ``IN`` lists so repeated lookups compare equal."""
+    return _IN_LIST.sub('IN (...)', sql)
+
+
+def query_origin():
+    """
+    Describe where the current query comes from: the serializer field being
+    rendered if there is one, otherwise the innermost application frame.
+    """
+    frame = sys._getframe(2)
+    app_frame = None
+    while frame is not None:
+        obj = frame.f_locals.get('self')
+        if isinstance(obj, Field) and obj.field_name:
+            return f'{type(obj.parent).__name__}.{obj.field_name}'
+        if app_frame is None and frame.f_code.co_filename.startswith(_APP_PATH):
+            app_frame = frame
+        frame = frame.f_back
+    if app_frame is not None:
+        filename = app_frame.f_code.co_filename[len(_APP_PATH):]
+        return f'apps/{filename}:{app_frame.f_lineno}'
+    return 'unknown'
+
+
+class QueryRecorder:
+    """
+    ``connection.execute_wrapper`` hook grouping queries by their SQL.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.patterns = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        pattern = self.patterns.setdefault(normalize_sql(sql), {'count': 0, 'origins': set()})
+        pattern['count'] += 1
+        pattern['origins'].add(query_origin())
+        return execute(sql, params, many, context)
+
+    def duplicates(self, threshold):
+        return {
+            sql: pattern for sql, pattern in self.patterns.items()
+            if pattern['count'] >= threshold
+        }
+
+    def report(self, budget, threshold):
+        """
+        Return a description of budget and duplicate problems, or ''.
+
+        A ``threshold`` of None skips the duplicate check.
+        """
+        problems = []
+        if budget is not None and self.count > budget:
+            problems.append(f'{self.count} queries, budget is {budget}')
+        duplicates = self.duplicates(threshold) if threshold is not None else {}
+        for sql, pattern in duplicates.items():
+            origins = ', '.join(sorted(pattern['origins']))
+            problems.append(f"{pattern['count']}x from {origins}: {sql[:200]}")
+        return '\n'.join(problems)
+
+
+def _duplicate_threshold():
+    return getattr(settings, 'QUERY_BUDGET_DUPLICATE_THRESHOLD', 3)
+
+
+@contextmanager
+def assert_query_budget(max_queries, duplicate_threshold=None):
+    """
+    Fail with AssertionError if the block runs more than ``max_queries``
+    queries or repeats a query ``duplicate_threshold`` times.
+    """
+    recorder = QueryRecorder()
+    with connection.execute_wrapper(recorder):
+        yield recorder
+    report = recorder.report(max_queries, duplicate_threshold or _duplicate_threshold())
+    if report:
+        raise AssertionError(f'Query budget exceeded:\n{report}')
+
+
+def query_budget(max_queries, duplicates=True):
+    """
+    Set the query budget of an ``@api_view`` function view.
+
+    Pass ``duplicates=False`` for views that repeat queries by design, such
+    as batched writes. Apply it above ``@api_view``.
+    """
+    def decorator(view):
+        view.cls.query_budget = max_queries
+        view.cls.query_budget_duplicates = duplicates
+        return view
+    return decorator
+
+
+class QueryBudgetMiddleware:
+    """
+    Check each request against its view's query budget.
+
+    Controlled by ``QUERY_BUDGET_MODE``: ``off``, ``warn`` (log and add an
+    ``X-Query-Count`` header) or ``raise``.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.mode = getattr(settings, 'QUERY_BUDGET_MODE', 'off')
+
+    def __call__(self, request):
+        if self.mode == 'off':
+            return self.get_response(request)
+
+        recorder = QueryRecorder()
+        with connection.execute_wrapper(recorder):
+            response = self.get_response(request)
+
+        budget = getattr(request, 'query_budget', None)
+        threshold = None
+        if getattr(request, 'query_budget_duplicates', True):
+            threshold = _duplicate_threshold()
+        report = recorder.report(budget, threshold)
+        if report:
+            message = f"Query budget problems in {request.method} {request.path}:\n{report}"
+            if self.mode == 'raise':
+                raise QueryBudgetExceeded(message)
+            logger.warning(message)
+        response['X-Query-Count'] = str(recorder.count)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        view_class = getattr(view_func, 'cls', None) or getattr(view_func, 'view_class', None)
+        request.query_budget = getattr(
+            view_class, 'query_budget', getattr(settings, 'QUERY_BUDGET_DEFAULT', None)
+        )
+        request.query_budget_duplicates = getattr(view_class, 'query_budget_duplicates', True)
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Lightweight read serializers for New Revolution.
+"""
+from decimal import Decimal, ROUND_HALF_UP
+from django.utils import timezone
+from rest_framework.response import Response
+
+# Returned by a converter to leave the field out, as DRF does for
+# read-only fields whose source is missing (e.g. a null foreign key)
+SKIP = object()
+
+
+def decimal_string(decimal_places):
+    """
+    Format Decimals like DRF's DecimalField with COERCE_DECIMAL_TO_STRING.
+    """
+    quantum = Decimal(1).scaleb(-decimal_places)
+
+    def convert(value):
+        if value is None:
+            return None
+        return '{:f}'.format(value.quantize(quantum, rounding=ROUND_HALF_UP))
+    return convert
+
+
+def datetime_string(value):
+    """
+    Format datetimes like DRF's DateTimeField with ISO_8601 output.
+    """
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = value.astimezone(timezone.get_current_timezone())
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+def display_name(first_name, last_name, username):
+    """
+    Mirror ``User.display_name`` from raw column values.
+    """
+    if first_name is None and last_name is None and username is None:
+        return SKIP
+    full_name = f"{first_name} {last_name}".strip()
+    return full_name if full_name else username
+
+
+class ValuesSerializer:
+    """
+    Serialize ``.values_list()`` rows through a precompiled field mapping.
+
+    ``field_map`` is a sequence of ``(name, sources, converter)``: ``sources``
+    is a lookup or tuple of lookups selected with ``.values_list()``, and
+    ``converter`` (optional, a callable or the name of a method) receives
+    their values and returns the output, or ``SKIP`` to omit the field. Subclasses must produce exactly the JSON
+    of the ModelSerializer they stand in for.
+    """
+    field_map = ()
+
+    def __init__(self, context=None):
+        self.context = context or {}
+        self._compiled = []
+        lookups = []
+        for name, sources, converter in self.field_map:
+            if isinstance(sources, str):
+                sources = (sources,)
+            indexes = []
+            for source in sources:
+                if source not in lookups:
+                    lookups.append(source)
+                indexes.append(lookups.index(source))
+            if isinstance(converter, str):
+                converter = getattr(self, converter)
+            self._compiled.append((name, tuple(indexes), converter))
+        self.lookups = tuple(lookups)
+
+    def prepare(self, rows):
+        """
+        Hook to load related data for a page of rows in bulk.
+        """
+
+    def serialize(self, rows):
+        rows = list(rows)
+        self.prepare(rows)
+        data = []
+        for row in rows:
+            item = {}
+            for name, indexes, converter in self._compiled:
+                if converter is None:
+                    value = row[indexes[0]]
+                else:
+                    value = converter(*[row[index] for index in indexes])
+                    if value is SKIP:
+                        continue
+                item[name] = value
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    Serve list responses from ``.values_list()`` rows via a ValuesSerializer.
+
+    Set ``values_serializer_class`` on a list view to enable the fast path;
+    filtering, ordering and pagination work unchanged.
+    """
+    values_serializer_class = None
+
+    def list(self, request, *args, **kwargs):
+        if self.values_serializer_class is None:
+            return super().list(request, *args, **kwargs)
+
+        serializer = self.values_serializer_class(context=self.get_serializer_context())
+        queryset = self.filter_queryset(self.get_queryset()).values_list(*serializer.lookups)
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(serializer.serialize(page))
+        return Response(serializer.serialize(queryset))
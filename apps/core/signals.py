@@ -0,0 +1,11 @@
+"""
+Signals for New Revolution.
+
+``soft_deleted`` and ``restored`` are sent with the model as ``sender`` and
+the affected primary keys as ``pks``, both for single instances and for
+each batch of a queryset operation (which sends no ``post_save``).
+"""
+from django.dispatch import Signal
+
+soft_deleted = Signal()
+restored = Signal()
\ No newline at end of file
@@ -0,0 +1,168 @@
+"""
+Rate limiting for New Revolution.
+"""
+import functools
+import math
+import threading
+import time
+from django.core.cache import cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import BaseThrottle
+import logging
+
+logger = logging.getLogger(__name__)
+
+# GCRA in one atomic round trip. Returns
+# {allowed, remaining, retry_after_ms, reset_ms}.
+GCRA_SCRIPT = """
+local clock = redis.call('TIME')
+local now = clock[1] * 1000 + math.floor(clock[2] / 1000)
+local period = tonumber(ARGV[1])
+local interval = tonumber(ARGV[2])
+local tat = tonumber(redis.call('GET', KEYS[1])) or now
+if tat < now then
+    tat = now
+end
+local new_tat = tat + interval
+local allow_at = new_tat - period
+if now < allow_at then
+    return {0, 0, allow_at - now, tat - now}
+end
+redis.call('SET', KEYS[1], new_tat, 'PX', new_tat - now)
+return {1, math.floor((now - allow_at) / interval), 0, new_tat - now}
+"""
+
+DURATIONS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
+_local_lock = threading.Lock()
+# Key to theoretical arrival time in ms for the in-process limiter; a key
+# expires once its arrival time has passed, as in ``GCRA_SCRIPT``
+_local_tats = {}
+# Drop expired keys once the in-process store grows past this many
+LOCAL_PRUNE_THRESHOLD = 10000
+
+
+def parse_rate(rate):
+    """
+    Parse a DRF-style rate such as ``'5/m'`` into ``(limit, period_seconds)``.
+    """
+    num, period = rate.split('/')
+    return int(num), DURATIONS[period[0]]
+
+
+@functools.lru_cache(maxsize=None)
+def _redis_script():
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return None
+    try:
+        client = get_redis_connection('default')
+    except NotImplementedError:
+        # The default cache is not a django-redis cache
+        return None
+    return client.register_script(GCRA_SCRIPT)
+
+
+def _check_local(key, period_ms, interval_ms):
+    """
+    Same algorithm as ``GCRA_SCRIPT`` on an in-process store.
+
+    Used without Redis and when Redis is unreachable, so it must not touch
+    the Django cache, which may be that same Redis. Atomic within a process
+    only, so each process enforces the limit on its own.
+    """
+    with _local_lock:
+        now = int(time.time() * 1000)
+        tat = max(_local_tats.get(key, now), now)
+        new_tat = tat + interval_ms
+        allow_at = new_tat - period_ms
+        if now < allow_at:
+            return 0, 0, allow_at - now, tat - now
+        if len(_local_tats) >= LOCAL_PRUNE_THRESHOLD:
+            for stale in [k for k, value in _local_tats.items() if value <= now]:
+                del _local_tats[stale]
+        _local_tats[key] = new_tat
+        return 1, (now - allow_at) // interval_ms, 0, new_tat - now
+
+
+def check_rate(key, limit, period):
+    """
+    Count one request against ``limit`` requests per ``period`` seconds.
+
+    Returns ``(allowed, remaining, retry_after, reset)``, times in seconds.
+    """
+    period_ms = period * 1000
+    interval_ms = math.ceil(period_ms / limit)
+    script = _redis_script()
+    result = None
+    if script is not None:
+        try:
+            result = script(keys=[cache.make_key(key)], args=[period_ms, interval_ms])
+        except Exception as e:
+            logger.warning(f"Redis rate limit check failed, using local limiter: {str(e)}")
+    if result is None:
+        try:
+            result = _check_local(key, period_ms, interval_ms)
+        except Exception as e:
+            # Never turn a limiter failure into a failed request
+            logger.warning(f"Local rate limit check failed, allowing request: {str(e)}")
+            return True, limit, 0, 0
+    allowed, remaining, retry_after_ms, reset_ms = (int(value) for value in result)
+    return bool(allowed), remaining, retry_after_ms / 1000, math.ceil(reset_ms / 1000)
+
+
+def throttle_scope(scope):
+    """
+    Set the rate limit budget of an ``@api_view`` function view.
+
+    Apply it above ``@api_view``.
+    """
+    def decorator(view):
+        view.cls.throttle_scope = scope
+        return view
+    return decorator
+
+
+class GCRAThrottle(BaseThrottle):
+    """
+    Rate limit requests with the generic cell rate algorithm.
+
+    Views name their budget with ``throttle_scope``; other views use the
+    ``user`` or ``anon`` budget. Budgets are the DRF ``DEFAULT_THROTTLE_RATES``.
+    Authenticated requests are counted per user, anonymous ones per client
+    IP. Each check is a single atomic script call on Redis, falling back to
+    an in-process limiter elsewhere or when Redis is unreachable. The outcome is reported in ``X-RateLimit-*``
+    headers by ``RateLimitHeadersMiddleware``.
+    """
+
+    def __init__(self):
+        self.retry_after = None
+
+    def get_scope(self, request, view):
+        scope = getattr(view, 'throttle_scope', None)
+        if scope:
+            return scope
+        return 'user' if request.user and request.user.is_authenticated else 'anon'
+
+    def allow_request(self, request, view):
+        scope = self.get_scope(request, view)
+        rate = api_settings.DEFAULT_THROTTLE_RATES.get(scope)
+        if rate is None:
+            return True
+
+        if request.user and request.user.is_authenticated:
+            ident = f'user:{request.user.pk}'
+        else:
+            ident = f'ip:{self.get_ident(request)}'
+
+        limit, period = parse_rate(rate)
+        allowed, remaining, retry_after, reset = check_rate(
+            f'ratelimit:{scope}:{ident}', limit, period
+        )
+        request._request.rate_limit = (limit, remaining, reset)
+        self.retry_after = retry_after
+        return allowed
+
+    def wait(self):
+        return self.retry_after
\ No newline at end of file
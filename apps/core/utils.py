@@ -1,12 +1,13 @@
 """
 Utility functions for New Revolution.
 """
+import functools
 import uuid
 import os
 from django.utils.text import slugify
 from django.core.files.storage import default_storage
 from PIL import Image
-import io
+import tempfile
 
 
 def generate_unique_filename(instance, filename):
@@ -44,34 +45,75 @@ def create_slug(text, max_length=50):
     return slug
 
 
+def _image_limits():
+    """
+    Return the (max_pixels, spool_max_size) limits for image processing.
+    """
+    from django.conf import settings
+
+    max_pixels = getattr(settings, 'MAX_IMAGE_PIXELS', 40_000_000)
+    spool_max_size = getattr(settings, 'IMAGE_SPOOL_MAX_SIZE', 2 * 1024 * 1024)
+    return max_pixels, spool_max_size
+
+
+def _open_image_header(image_file, max_pixels):
+    """
+    Open an image lazily and reject decompression bombs.
+
+    ``Image.open`` only parses the file header, so the dimensions are known
+    before any pixel data is decoded.
+    """
+    if hasattr(image_file, 'seek'):
+        image_file.seek(0)
+    image = Image.open(image_file)
+    width, height = image.size
+    if width * height > max_pixels:
+        raise ValueError(
+            f"Image is too large ({width}x{height}). "
+            f"Maximum is {max_pixels} pixels."
+        )
+    return image
+
+
 def resize_image(image_file, max_width=1200, max_height=1200, quality=85):
     """
     Resize an image while maintaining aspect ratio.
+
+    Large JPEGs are downscaled on load (draft mode) and other formats are
+    reduced before resampling, so the full-resolution bitmap is never held
+    in memory. The result is written to a spooled temporary file that moves
+    to disk once it grows past ``IMAGE_SPOOL_MAX_SIZE``.
     """
+    max_pixels, spool_max_size = _image_limits()
     try:
-        image = Image.open(image_file)
-        
+        image = _open_image_header(image_file, max_pixels)
+
+        # Let the JPEG decoder scale by 1/2, 1/4 or 1/8 while decoding
+        if image.format == 'JPEG':
+            image.draft('RGB', (max_width, max_height))
+
+        # thumbnail() reduces on load before the final LANCZOS pass and
+        # never upscales
+        image.thumbnail(
+            (max_width, max_height),
+            Image.Resampling.LANCZOS,
+            reducing_gap=3.0,
+        )
+
         # Convert to RGB if necessary
         if image.mode in ('RGBA', 'LA', 'P'):
             image = image.convert('RGB')
-        
-        # Calculate new dimensions
-        width, height = image.size
-        ratio = min(max_width / width, max_height / height)
-        
-        if ratio < 1:
-            new_width = int(width * ratio)
-            new_height = int(height * ratio)
-            image = image.resize((new_width, new_height), Image.Resampling.LANCZOS)
-        
-        # Save to bytes
-        output = io.BytesIO()
+
+        output = tempfile.SpooledTemporaryFile(max_size=spool_max_size)
         image.save(output, format='JPEG', quality=quality, optimize=True)
+        image.close()
         output.seek(0)
-        
+
         return output
-    except Exception as e:
+    except Exception:
         # Return original file if resize fails
+        if hasattr(image_file, 'seek'):
+            image_file.seek(0)
         return image_file
 
 
@@ -88,35 +130,97 @@ def validate_image_file(file):
     if file.content_type not in allowed_types:
         raise ValueError("Invalid file type. Only JPEG, PNG, WebP, and GIF are allowed.")
     
-    # Validate image
+    # Validate dimensions from the header, then the file structure
+    max_pixels, _ = _image_limits()
     try:
-        image = Image.open(file)
+        image = _open_image_header(file, max_pixels)
         image.verify()
+    except ValueError:
+        raise
     except Exception:
         raise ValueError("Invalid image file.")
+    finally:
+        file.seek(0)
     
     return True
 
 
-def send_notification_email(user, subject, template, context=None):
+@functools.lru_cache(maxsize=64)
+def _compiled_email_templates(template):
     """
-    Send notification email to user.
+    Load and compile the HTML and text templates for an email once.
+    """
+    from django.template.loader import get_template
+    
+    html_template = get_template(f'emails/{template}.html').template
+    text_template = get_template(f'emails/{template}.txt').template
+    return html_template, text_template
+
+
+def get_email_templates(template):
+    """
+    Return compiled (html, text) templates for an email.
+
+    Compiled templates are memoized per process; in DEBUG they are reloaded
+    on each call so template edits show up without a restart.
     """
-    from django.core.mail import send_mail
-    from django.template.loader import render_to_string
     from django.conf import settings
     
-    if context is None:
-        context = {}
+    if settings.DEBUG:
+        _compiled_email_templates.cache_clear()
+    return _compiled_email_templates(template)
+
+
+def _email_base_context():
+    """
+    Return the site-wide values available to every email template.
+    """
+    from django.conf import settings
     
-    context.update({
-        'user': user,
+    return {
         'site_name': 'New Revolution',
         'site_url': settings.FRONTEND_DOMAIN or 'https://newrevolution.netlify.app',
-    })
+    }
+
+
+def render_notification_email(user, template, context=None):
+    """
+    Render the HTML and text bodies of a notification email.
+    """
+    return next(bulk_render_notification_emails(template, [(user, context)]))
+
+
+def bulk_render_notification_emails(template, recipients):
+    """
+    Render one email template for many recipients.
+
+    ``recipients`` is an iterable of ``(user, context)`` pairs; an
+    ``(html, text)`` tuple is yielded for each. The templates are compiled
+    once and a single Context is reused, with each recipient's values pushed
+    on top of the shared site values and popped after rendering.
+    """
+    from django.template import Context
+    
+    html_template, text_template = get_email_templates(template)
+    shared = Context(_email_base_context())
+    
+    for user, context in recipients:
+        values = dict(context or {})
+        values['user'] = user
+        with shared.push(values):
+            html_message = html_template.render(shared)
+            text_message = text_template.render(shared)
+        yield html_message, text_message
+
+
+def send_notification_email(user, subject, template, context=None):
+    """
+    Send notification email to user.
+    """
+    from django.core.mail import send_mail
+    from django.conf import settings
     
-    html_message = render_to_string(f'emails/{template}.html', context)
-    text_message = render_to_string(f'emails/{template}.txt', context)
+    html_message, text_message = render_notification_email(user, template, context)
     
     try:
         send_mail(
@@ -136,6 +240,59 @@ def send_notification_email(user, subject, template, context=None):
         return False
 
 
+def queue_notification_email(user, subject, template, context=None, idempotency_key=None):
+    """
+    Queue a notification email in the outbox for background delivery.
+
+    ``context`` must be JSON-serializable. Emails are deduplicated by
+    ``idempotency_key``; when omitted it is derived from the template,
+    user and context. Delivery is triggered once the current transaction
+    commits.
+    """
+    import hashlib
+    import json
+    from django.db import transaction
+    from apps.notifications.models import EmailOutbox
+    
+    context = context or {}
+    if idempotency_key is None:
+        digest = hashlib.sha256(
+            json.dumps(context, sort_keys=True, default=str).encode()
+        ).hexdigest()[:16]
+        idempotency_key = f"{template}:{user.pk}:{digest}"
+    
+    email, created = EmailOutbox.objects.get_or_create(
+        idempotency_key=idempotency_key,
+        defaults={
+            'user': user,
+            'recipient': user.email,
+            'subject': subject,
+            'template': template,
+            'context': context,
+        }
+    )
+    
+    if created:
+        transaction.on_commit(_schedule_outbox_delivery)
+    return email
+
+
+def _schedule_outbox_delivery():
+    """
+    Ask a worker to deliver queued emails now.
+
+    If the broker is unavailable the periodic beat task picks the email up.
+    """
+    from apps.notifications.tasks import deliver_email_outbox
+    
+    try:
+        deliver_email_outbox.delay()
+    except Exception as e:
+        import logging
+        logger = logging.getLogger(__name__)
+        logger.warning(f"Could not schedule email outbox delivery: {str(e)}")
+
+
 def format_currency(amount, currency='USD'):
     """
     Format currency amount.
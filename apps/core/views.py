@@ -1,64 +1,49 @@
 """
 Core views for the New Revolution marketplace.
 """
-from django.http import JsonResponse
-from django.db import connection
-from django.core.cache import cache
+from django.utils.cache import add_never_cache_headers
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import AllowAny
-import redis
-import os
+from .health import get_readiness
 
 
-class HealthCheckView(APIView):
+class LivenessView(APIView):
     """
-    Health check endpoint for monitoring.
+    Liveness probe: the process is up and serving requests.
     """
+    authentication_classes = []
     permission_classes = [AllowAny]
+    throttle_classes = []
 
     def get(self, request):
-        """
-        Perform health checks on various services.
-        """
-        health_status = {
-            'status': 'healthy',
-            'timestamp': timezone.now().isoformat(),
-            'services': {}
-        }
+        response = Response({'status': 'alive'})
+        add_never_cache_headers(response)
+        return response
 
-        # Check database connection
-        try:
-            with connection.cursor() as cursor:
-                cursor.execute("SELECT 1")
-            health_status['services']['database'] = 'healthy'
-        except Exception as e:
-            health_status['services']['database'] = f'unhealthy: {str(e)}'
-            health_status['status'] = 'unhealthy'
 
-        # Check Redis connection
-        try:
-            cache.set('health_check', 'ok', 10)
-            cache.get('health_check')
-            health_status['services']['redis'] = 'healthy'
-        except Exception as e:
-            health_status['services']['redis'] = f'unhealthy: {str(e)}'
-            health_status['status'] = 'unhealthy'
+class HealthCheckView(APIView):
+    """
+    Readiness probe for monitoring and load balancers.
 
-        # Check environment variables
-        required_env_vars = ['SECRET_KEY', 'DATABASE_URL']
-        missing_vars = [var for var in required_env_vars if not os.getenv(var)]
-        
-        if missing_vars:
-            health_status['services']['environment'] = f'missing variables: {", ".join(missing_vars)}'
-            health_status['status'] = 'unhealthy'
-        else:
-            health_status['services']['environment'] = 'healthy'
+    Database, cache, channel layer and Celery broker are checked
+    concurrently with a per-check timeout; the result is reused for a few
+    seconds so frequent probes do not load the dependencies.
+    """
+    authentication_classes = []
+    permission_classes = [AllowAny]
+    throttle_classes = []
 
-        response_status = status.HTTP_200_OK if health_status['status'] == 'healthy' else status.HTTP_503_SERVICE_UNAVAILABLE
-        
-        return Response(health_status, status=response_status)
+    def get(self, request):
+        readiness = get_readiness()
+        response_status = (
+            status.HTTP_200_OK if readiness['status'] == 'ready'
+            else status.HTTP_503_SERVICE_UNAVAILABLE
+        )
+        response = Response(readiness, status=response_status)
+        add_never_cache_headers(response)
+        return response
 
 
 class APIRootView(APIView):
@@ -112,5 +97,8 @@ class APIRootView(APIView):
                 },
             },
             'documentation': '/api/v1/docs/',
-            'health': '/health/',
+            'health': {
+                'live': '/health/live/',
+                'ready': '/health/ready/',
+            },
         })
\ No newline at end of file
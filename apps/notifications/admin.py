@@ -2,15 +2,27 @@
 Admin configuration for notifications app.
 """
 from django.contrib import admin
-from .models import Notification
+from apps.core.admin import SoftDeleteAdmin
+from .models import Notification, EmailOutbox
 
 
 @admin.register(Notification)
-class NotificationAdmin(admin.ModelAdmin):
+class NotificationAdmin(SoftDeleteAdmin):
     list_display = (
         'recipient', 'sender', 'notification_type', 'title',
         'is_read', 'created_at'
     )
     list_filter = ('notification_type', 'is_read', 'created_at')
     search_fields = ('recipient__email', 'sender__email', 'title', 'message')
-    readonly_fields = ('created_at', 'updated_at', 'read_at')
\ No newline at end of file
+    readonly_fields = ('created_at', 'updated_at', 'read_at')
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = (
+        'recipient', 'template', 'provider', 'status', 'attempts',
+        'next_attempt_at', 'sent_at'
+    )
+    list_filter = ('status', 'provider', 'template')
+    search_fields = ('recipient', 'idempotency_key', 'subject')
+    readonly_fields = ('created_at', 'updated_at', 'sent_at', 'attempts', 'last_error')
\ No newline at end of file
@@ -2,7 +2,9 @@
 Notification models for New Revolution marketplace.
 """
 from django.db import models
-from apps.core.models import BaseModel
+from django.db.models import Q
+from django.utils import timezone
+from apps.core.models import BaseModel, TimeStampedModel
 
 
 class Notification(BaseModel):
@@ -54,13 +56,68 @@ class Notification(BaseModel):
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['recipient', '-created_at'],
+                name='notifications_live_recip_idx',
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['recipient'],
+                name='notifications_live_unread_idx',
+                condition=Q(is_deleted=False, is_read=False),
+            ),
+        ]
 
     def __str__(self):
         return f"Notification for {self.recipient.display_name}: {self.title}"
 
     def mark_as_read(self):
         """Mark notification as read."""
-        from django.utils import timezone
         self.is_read = True
         self.read_at = timezone.now()
-        self.save(update_fields=['is_read', 'read_at'])
\ No newline at end of file
+        self.save(update_fields=['is_read', 'read_at'])
+
+class EmailOutbox(TimeStampedModel):
+    """
+    Queued transactional email, delivered in batches by a background worker.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('sending', 'Sending'),
+        ('sent', 'Sent'),
+        ('failed', 'Failed'),
+    ]
+
+    idempotency_key = models.CharField(max_length=255, unique=True)
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='outbox_emails',
+        null=True,
+        blank=True
+    )
+    recipient = models.EmailField()
+    subject = models.CharField(max_length=255)
+    template = models.CharField(max_length=100)
+    context = models.JSONField(default=dict, blank=True)
+    provider = models.CharField(max_length=50, default='resend')
+
+    # Delivery state
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        db_table = 'email_outbox'
+        verbose_name = 'Outbox Email'
+        verbose_name_plural = 'Email Outbox'
+        ordering = ['next_attempt_at']
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+
+    def __str__(self):
+        return f"{self.template} to {self.recipient} ({self.status})"
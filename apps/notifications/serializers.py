@@ -2,6 +2,7 @@
 Serializers for notifications app.
 """
 from rest_framework import serializers
+from apps.core.serializers import ValuesSerializer, datetime_string, display_name
 from .models import Notification
 
 
@@ -18,4 +19,24 @@ class NotificationSerializer(serializers.ModelSerializer):
             'title', 'message', 'is_read', 'read_at', 'product', 'conversation',
             'created_at'
         )
-        read_only_fields = ('recipient', 'created_at')
\ No newline at end of file
+        read_only_fields = ('recipient', 'created_at')
+
+
+class NotificationValuesSerializer(ValuesSerializer):
+    """
+    Fast path producing the same output as NotificationSerializer.
+    """
+    field_map = (
+        ('id', 'id', None),
+        ('recipient', 'recipient_id', None),
+        ('sender', 'sender_id', None),
+        ('sender_name', ('sender__first_name', 'sender__last_name', 'sender__username'), display_name),
+        ('notification_type', 'notification_type', None),
+        ('title', 'title', None),
+        ('message', 'message', None),
+        ('is_read', 'is_read', None),
+        ('read_at', 'read_at', datetime_string),
+        ('product', 'product_id', None),
+        ('conversation', 'conversation_id', None),
+        ('created_at', 'created_at', datetime_string),
+    )
\ No newline at end of file
@@ -0,0 +1,194 @@
+"""
+Background tasks for notifications app.
+"""
+import time
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.core.cache import cache
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+from apps.core.backends import IDEMPOTENCY_HEADER
+from apps.core.utils import render_notification_email
+from .models import EmailOutbox
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def _acquire_quota(provider, requested):
+    """
+    Reserve up to ``requested`` sends from the provider's per-minute budget.
+
+    Returns the number of sends granted and the budget key to hand unused
+    sends back to, None when the provider has no limit.
+    """
+    limit = getattr(settings, 'EMAIL_OUTBOX_RATE_LIMITS', {}).get(provider)
+    if not limit:
+        return requested, None
+
+    key = f'email_outbox:rate:{provider}:{int(time.time() // 60)}'
+    cache.add(key, 0, timeout=120)
+    used = cache.incr(key, requested)
+    granted = max(0, min(requested, limit - (used - requested)))
+    if granted < requested:
+        cache.decr(key, requested - granted)
+    return granted, key
+
+
+def _release_quota(key, unused):
+    """
+    Give ``unused`` reserved sends back to the budget under ``key``.
+    """
+    if key is None or not unused:
+        return
+    try:
+        cache.decr(key, unused)
+    except ValueError:
+        # The budget's minute has already expired
+        pass
+
+
+def _due_filter(now):
+    """
+    Match emails due for delivery.
+
+    Rows left in ``sending`` by a crashed worker are due again after
+    ``EMAIL_OUTBOX_SENDING_TIMEOUT`` seconds.
+    """
+    stale = now - timedelta(seconds=getattr(settings, 'EMAIL_OUTBOX_SENDING_TIMEOUT', 600))
+    return (
+        Q(status='pending', next_attempt_at__lte=now) |
+        Q(status='sending', updated_at__lt=stale)
+    )
+
+
+def _claim_batch(provider, limit):
+    """
+    Lock and mark up to ``limit`` due emails as sending.
+    """
+    now = timezone.now()
+
+    with transaction.atomic():
+        ids = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(_due_filter(now), provider=provider)
+            # Ties broken by id so a failed chunk is claimed again as one
+            .order_by('next_attempt_at', 'id')
+            .values_list('id', flat=True)[:limit]
+        )
+        EmailOutbox.objects.filter(id__in=ids).update(
+            status='sending',
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+
+    return list(EmailOutbox.objects.filter(id__in=ids).select_related('user'))
+
+
+def _deliver_batch(batch):
+    """
+    Render and send a claimed batch, recording the outcome of each email.
+    """
+    max_attempts = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+    now = timezone.now()
+    messages = []
+    rendered = []
+    failed = []
+
+    for email in batch:
+        try:
+            html_message, text_message = render_notification_email(
+                email.user, email.template, email.context
+            )
+        except Exception as e:
+            # Rendering errors will not fix themselves on retry
+            email.status = 'failed'
+            email.last_error = f"Render failed: {str(e)}"
+            failed.append(email)
+            continue
+
+        message = EmailMultiAlternatives(
+            subject=email.subject,
+            body=text_message,
+            from_email=settings.DEFAULT_FROM_EMAIL,
+            to=[email.recipient],
+            headers={IDEMPOTENCY_HEADER: email.idempotency_key},
+        )
+        message.attach_alternative(html_message, 'text/html')
+        messages.append(message)
+        rendered.append(email)
+
+    if rendered:
+        connection = get_connection(fail_silently=False)
+        # Send one backend request's worth at a time, so a failure only
+        # puts back the emails of the request that failed
+        chunk_size = getattr(connection, 'BATCH_SIZE', None) or len(rendered)
+        for start in range(0, len(rendered), chunk_size):
+            chunk = rendered[start:start + chunk_size]
+            try:
+                connection.send_messages(messages[start:start + chunk_size])
+            except Exception as e:
+                logger.error(f"Email outbox delivery failed for {len(chunk)} emails: {str(e)}")
+                for email in chunk:
+                    email.last_error = str(e)
+                    if email.attempts >= max_attempts:
+                        email.status = 'failed'
+                    else:
+                        email.status = 'pending'
+                        email.next_attempt_at = now + timedelta(minutes=2 ** (email.attempts - 1))
+                    failed.append(email)
+            else:
+                EmailOutbox.objects.filter(id__in=[email.id for email in chunk]).update(
+                    status='sent',
+                    sent_at=now,
+                    last_error='',
+                    updated_at=now,
+                )
+
+    if failed:
+        for email in failed:
+            email.updated_at = now
+        EmailOutbox.objects.bulk_update(
+            failed, ['status', 'last_error', 'next_attempt_at', 'updated_at']
+        )
+
+    return len(batch) - len(failed)
+
+
+@shared_task(ignore_result=True)
+def deliver_email_outbox(batch_size=None):
+    """
+    Deliver due outbox emails in batches, one provider at a time.
+
+    Re-queues itself while full batches (as many emails as the rate limit
+    allowed) are still being delivered.
+    """
+    batch_size = batch_size or getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100)
+    now = timezone.now()
+    providers = (
+        EmailOutbox.objects.filter(_due_filter(now))
+        .values_list('provider', flat=True)
+        .distinct()
+    )
+
+    sent_count = 0
+    has_more = False
+    for provider in list(providers):
+        quota, quota_key = _acquire_quota(provider, batch_size)
+        if not quota:
+            logger.info(f"Email outbox rate limit reached for {provider}")
+            continue
+
+        batch = _claim_batch(provider, quota)
+        _release_quota(quota_key, quota - len(batch))
+        if batch:
+            sent_count += _deliver_batch(batch)
+        has_more = has_more or len(batch) == quota
+
+    if has_more:
+        deliver_email_outbox.delay(batch_size)
+
+    return sent_count
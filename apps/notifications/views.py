@@ -5,15 +5,18 @@ from rest_framework import generics, permissions, status
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from .models import Notification
-from .serializers import NotificationSerializer
+from apps.core.serializers import ValuesListMixin
+from .serializers import NotificationSerializer, NotificationValuesSerializer
 
 
-class NotificationListView(generics.ListAPIView):
+class NotificationListView(ValuesListMixin, generics.ListAPIView):
     """
     List user's notifications.
     """
     serializer_class = NotificationSerializer
+    values_serializer_class = NotificationValuesSerializer
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 10
 
     def get_queryset(self):
         return Notification.objects.filter(recipient=self.request.user)
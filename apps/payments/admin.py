@@ -2,11 +2,14 @@
 Admin configuration for payments app.
 """
 from django.contrib import admin
-from .models import Payment, BoostPackage
+from django.db import transaction
+from apps.core.admin import SoftDeleteAdmin
+from apps.core.exports import ExportAdminMixin
+from .models import Payment, BoostPackage, StripeEvent
 
 
 @admin.register(Payment)
-class PaymentAdmin(admin.ModelAdmin):
+class PaymentAdmin(ExportAdminMixin, SoftDeleteAdmin):
     list_display = (
         'id', 'user', 'product', 'amount', 'currency', 
         'status', 'created_at'
@@ -14,10 +17,55 @@ class PaymentAdmin(admin.ModelAdmin):
     list_filter = ('status', 'currency', 'created_at')
     search_fields = ('user__email', 'stripe_payment_intent_id', 'description')
     readonly_fields = ('created_at', 'updated_at')
+    export_columns = (
+        ('id', 'id'),
+        ('user', 'user_id'),
+        ('user_email', 'user__email'),
+        ('product', 'product_id'),
+        ('boost_package', 'boost_package__name'),
+        ('amount', 'amount'),
+        ('currency', 'currency'),
+        ('status', 'status'),
+        ('stripe_payment_intent_id', 'stripe_payment_intent_id'),
+        ('created_at', 'created_at'),
+    )
 
 
 @admin.register(BoostPackage)
-class BoostPackageAdmin(admin.ModelAdmin):
+class BoostPackageAdmin(SoftDeleteAdmin):
     list_display = ('name', 'price', 'duration_days', 'is_active')
     list_filter = ('is_active',)
-    search_fields = ('name', 'description')
\ No newline at end of file
+    search_fields = ('name', 'description')
+
+
+@admin.register(StripeEvent)
+class StripeEventAdmin(admin.ModelAdmin):
+    list_display = (
+        'event_id', 'event_type', 'payment', 'status', 'attempts',
+        'stripe_created', 'processed_at'
+    )
+    list_filter = ('status', 'event_type')
+    search_fields = ('event_id', 'payment__stripe_payment_intent_id')
+    readonly_fields = (
+        'created_at', 'updated_at', 'processed_at', 'payload', 'error',
+        'attempts', 'next_attempt_at'
+    )
+    actions = ['retry_events', 'ignore_events']
+
+    def _resolve(self, request, queryset, **changes):
+        from .views import _schedule_payment_events
+
+        payment_ids = set(queryset.exclude(payment=None).values_list('payment_id', flat=True))
+        updated = queryset.filter(status__in=['pending', 'failed']).update(**changes)
+        for payment_id in payment_ids:
+            transaction.on_commit(lambda payment_id=payment_id: _schedule_payment_events(str(payment_id)))
+        self.message_user(request, f'{updated} events updated.')
+
+    @admin.action(description='Retry selected failed or pending events')
+    def retry_events(self, request, queryset):
+        self._resolve(request, queryset, status='pending', attempts=0, next_attempt_at=None)
+
+    @admin.action(description='Ignore selected failed or pending events')
+    def ignore_events(self, request, queryset):
+        # Later events of the payment are applied without these
+        self._resolve(request, queryset, status='ignored', next_attempt_at=None)
\ No newline at end of file
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class PaymentsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.payments'
-    verbose_name = 'Payments'
\ No newline at end of file
+    verbose_name = 'Payments'
+
+    def ready(self):
+        from apps.core.cache import track_model_version
+        track_model_version(self.get_model('BoostPackage'))
\ No newline at end of file
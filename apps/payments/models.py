@@ -2,7 +2,7 @@
 Payment models for New Revolution marketplace.
 """
 from django.db import models
-from apps.core.models import BaseModel
+from apps.core.models import BaseModel, TimeStampedModel
 
 
 class Payment(BaseModel):
@@ -33,12 +33,22 @@ class Payment(BaseModel):
     status = models.CharField(max_length=20, choices=PAYMENT_STATUS_CHOICES, default='pending')
     stripe_payment_intent_id = models.CharField(max_length=255, blank=True)
     description = models.TextField(blank=True)
+    boost_package = models.ForeignKey(
+        'payments.BoostPackage',
+        on_delete=models.SET_NULL,
+        related_name='payments',
+        null=True,
+        blank=True
+    )
 
     class Meta:
         db_table = 'payments'
         verbose_name = 'Payment'
         verbose_name_plural = 'Payments'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['stripe_payment_intent_id']),
+        ]
 
     def __str__(self):
         return f"Payment {self.id} - {self.amount} {self.currency}"
@@ -61,4 +71,73 @@ class BoostPackage(BaseModel):
         ordering = ['price']
 
     def __str__(self):
-        return f"{self.name} - ${self.price}"
\ No newline at end of file
+        return f"{self.name} - ${self.price}"
+
+
+class IdempotencyKey(TimeStampedModel):
+    """
+    Stored result of an idempotent request, so client retries replay it.
+    """
+    user = models.ForeignKey(
+        'accounts.User',
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    key = models.CharField(max_length=255)
+    request_hash = models.CharField(max_length=64)
+    payment = models.ForeignKey(
+        Payment,
+        on_delete=models.CASCADE,
+        related_name='idempotency_keys'
+    )
+    response = models.JSONField(default=dict)
+
+    class Meta:
+        db_table = 'idempotency_keys'
+        verbose_name = 'Idempotency Key'
+        verbose_name_plural = 'Idempotency Keys'
+        unique_together = ('user', 'key')
+
+    def __str__(self):
+        return f"{self.key} ({self.user_id})"
+
+
+class StripeEvent(TimeStampedModel):
+    """
+    Verified Stripe webhook event, stored before it is applied.
+    """
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('processed', 'Processed'),
+        ('ignored', 'Ignored'),
+        ('failed', 'Failed'),
+    ]
+
+    event_id = models.CharField(max_length=255, unique=True)
+    event_type = models.CharField(max_length=100)
+    stripe_created = models.DateTimeField()
+    payload = models.JSONField()
+    payment = models.ForeignKey(
+        Payment,
+        on_delete=models.CASCADE,
+        related_name='stripe_events',
+        null=True,
+        blank=True
+    )
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    processed_at = models.DateTimeField(null=True, blank=True)
+    error = models.TextField(blank=True)
+
+    class Meta:
+        db_table = 'stripe_events'
+        verbose_name = 'Stripe Event'
+        verbose_name_plural = 'Stripe Events'
+        ordering = ['stripe_created']
+        indexes = [
+            models.Index(fields=['payment', 'status', 'stripe_created']),
+        ]
+
+    def __str__(self):
+        return f"{self.event_type} ({self.event_id})"
\ No newline at end of file
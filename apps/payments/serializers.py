@@ -12,7 +12,7 @@ class PaymentSerializer(serializers.ModelSerializer):
     class Meta:
         model = Payment
         fields = (
-            'id', 'user', 'product', 'amount', 'currency', 'status',
+            'id', 'user', 'product', 'boost_package', 'amount', 'currency', 'status',
             'stripe_payment_intent_id', 'description', 'created_at'
         )
         read_only_fields = ('user', 'created_at')
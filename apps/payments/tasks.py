@@ -0,0 +1,140 @@
+"""
+Background tasks for payments app.
+"""
+from datetime import timedelta
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+from .models import Payment, StripeEvent
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Stripe event type -> payment status it moves the payment to
+EVENT_STATUS = {
+    'payment_intent.succeeded': 'completed',
+    'payment_intent.payment_failed': 'failed',
+    'payment_intent.canceled': 'failed',
+    'charge.refunded': 'refunded',
+}
+
+# Status transitions a Stripe event is allowed to make
+ALLOWED_TRANSITIONS = {
+    'pending': {'completed', 'failed'},
+    'failed': {'completed', 'failed'},
+    'completed': {'refunded'},
+    'refunded': set(),
+}
+
+
+def _apply_event(payment, event):
+    """
+    Apply one Stripe event to its (locked) payment.
+    """
+    new_status = EVENT_STATUS.get(event.event_type)
+    if new_status is None or new_status not in ALLOWED_TRANSITIONS[payment.status]:
+        return 'ignored'
+
+    payment.status = new_status
+    payment.save(update_fields=['status', 'updated_at'])
+
+    if new_status == 'completed' and payment.boost_package_id and payment.product_id:
+        payment.product.boost(payment.boost_package.duration_days)
+        logger.info(f"Boost activated for product {payment.product_id} by payment {payment.id}")
+
+    return 'processed'
+
+
+def _record_failure(event, error, now):
+    """
+    Schedule a failed event for retry, or give up after too many attempts.
+    """
+    max_attempts = getattr(settings, 'STRIPE_EVENT_MAX_ATTEMPTS', 5)
+    event.attempts += 1
+    event.error = error
+    if event.attempts >= max_attempts:
+        event.status = 'failed'
+        event.processed_at = now
+        event.next_attempt_at = None
+    else:
+        event.next_attempt_at = now + timedelta(minutes=2 ** (event.attempts - 1))
+    event.save(update_fields=[
+        'status', 'attempts', 'error', 'processed_at', 'next_attempt_at', 'updated_at'
+    ])
+
+
+@shared_task(ignore_result=True)
+def process_payment_events(payment_id):
+    """
+    Apply a payment's pending Stripe events in the order Stripe created them.
+
+    The payment row is locked for the duration, so events for one payment
+    are never applied concurrently. An event that fails to apply stays
+    pending and is retried with exponential backoff by the periodic sweep;
+    later events of the payment wait until it succeeds. After
+    ``STRIPE_EVENT_MAX_ATTEMPTS`` attempts it is marked failed, and keeps
+    blocking later events until it is resolved in the admin.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        try:
+            payment = (
+                Payment.objects.select_for_update()
+                .select_related('product', 'boost_package')
+                .get(id=payment_id)
+            )
+        except Payment.DoesNotExist:
+            return
+
+        events = StripeEvent.objects.filter(
+            payment=payment, status__in=['pending', 'failed']
+        ).order_by('stripe_created', 'created_at')
+
+        for event in events:
+            if event.status == 'failed':
+                logger.warning(
+                    f"Stripe events of payment {payment.id} are blocked by failed event {event.event_id}"
+                )
+                break
+            if event.next_attempt_at and event.next_attempt_at > now:
+                break
+
+            try:
+                with transaction.atomic():
+                    status = _apply_event(payment, event)
+            except Exception as e:
+                logger.error(f"Failed to apply Stripe event {event.event_id}: {str(e)}")
+                _record_failure(event, str(e), now)
+                break
+
+            event.status = status
+            event.error = ''
+            event.next_attempt_at = None
+            event.processed_at = now
+            event.save(update_fields=[
+                'status', 'error', 'next_attempt_at', 'processed_at', 'updated_at'
+            ])
+
+
+@shared_task(ignore_result=True)
+def process_pending_stripe_events():
+    """
+    Apply Stripe events whose processing task never ran or that are due
+    for a retry.
+    """
+    now = timezone.now()
+    cutoff = now - timedelta(minutes=1)
+    payment_ids = (
+        StripeEvent.objects.filter(
+            Q(next_attempt_at__isnull=True, created_at__lt=cutoff) |
+            Q(next_attempt_at__lte=now),
+            status='pending',
+        )
+        .values_list('payment_id', flat=True)
+        .order_by()
+        .distinct()
+    )
+    for payment_id in payment_ids:
+        process_payment_events(str(payment_id))
\ No newline at end of file
@@ -8,6 +8,8 @@ app_name = 'payments'
 
 urlpatterns = [
     path('', views.PaymentListView.as_view(), name='payment-list'),
+    path('export/', views.PaymentExportView.as_view(), name='payment-export'),
     path('boost-packages/', views.BoostPackageListView.as_view(), name='boost-package-list'),
     path('create-intent/', views.create_payment_intent, name='create-payment-intent'),
+    path('webhook/stripe/', views.stripe_webhook, name='stripe-webhook'),
 ]
\ No newline at end of file
@@ -1,11 +1,31 @@
 """
 Views for payments app.
 """
+import hashlib
+import json
+from datetime import datetime, timezone as dt_timezone
+from decimal import Decimal, InvalidOperation
+import stripe
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
 from rest_framework import generics, permissions, status
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import (
+    api_view, authentication_classes, permission_classes, throttle_classes
+)
 from rest_framework.response import Response
-from .models import Payment, BoostPackage
+from apps.core.cache import CachedCatalogMixin
+from apps.core.exports import ExportView
+from apps.products.models import Product
+from .models import Payment, BoostPackage, IdempotencyKey, StripeEvent
 from .serializers import PaymentSerializer, BoostPackageSerializer
+import logging
+
+logger = logging.getLogger(__name__)
+
+stripe.api_key = settings.STRIPE_SECRET_KEY
+if settings.STRIPE_API_BASE:
+    stripe.api_base = settings.STRIPE_API_BASE
 
 
 class PaymentListView(generics.ListAPIView):
@@ -19,39 +39,266 @@ class PaymentListView(generics.ListAPIView):
         return Payment.objects.filter(user=self.request.user)
 
 
-class BoostPackageListView(generics.ListAPIView):
+class PaymentExportView(ExportView):
+    """
+    Stream the current user's payments as CSV or JSONL.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+    export_name = 'payments'
+    export_columns = (
+        ('id', 'id'),
+        ('product', 'product_id'),
+        ('product_title', 'product__title'),
+        ('boost_package', 'boost_package__name'),
+        ('amount', 'amount'),
+        ('currency', 'currency'),
+        ('status', 'status'),
+        ('description', 'description'),
+        ('created_at', 'created_at'),
+    )
+
+    def get_queryset(self):
+        return Payment.objects.filter(user=self.request.user).order_by('-created_at')
+
+
+class BoostPackageListView(CachedCatalogMixin, generics.ListAPIView):
     """
     List available boost packages.
     """
+    catalog_models = (BoostPackage,)
     queryset = BoostPackage.objects.filter(is_active=True)
     serializer_class = BoostPackageSerializer
     permission_classes = [permissions.AllowAny]
 
 
+def _replay_idempotent_response(record, request_hash):
+    """
+    Return the stored response for a retried request.
+    """
+    if record.request_hash != request_hash:
+        return Response(
+            {'error': 'Idempotency-Key was already used with a different request'},
+            status=status.HTTP_422_UNPROCESSABLE_ENTITY
+        )
+    return Response(record.response)
+
+
+def _create_stripe_intent(payment):
+    """
+    Create the Stripe PaymentIntent for a payment and return its client secret.
+
+    The Stripe idempotency key is derived from the payment, so creating the
+    intent again for the same payment returns the first intent. Without a
+    Stripe key configured a demo secret is returned.
+    """
+    if not settings.STRIPE_SECRET_KEY:
+        return f'demo_secret_{payment.id}'
+
+    intent = stripe.PaymentIntent.create(
+        amount=int(payment.amount * 100),
+        currency=payment.currency.lower(),
+        description=payment.description,
+        metadata={'payment_id': str(payment.id)},
+        idempotency_key=f'payment-intent:{payment.id}',
+    )
+    payment.stripe_payment_intent_id = intent.id
+    payment.save(update_fields=['stripe_payment_intent_id', 'updated_at'])
+    return intent.client_secret
+
+
+def _complete_payment_intent(payment, record=None):
+    """
+    Create a stored payment's Stripe intent and respond with its secret.
+
+    Runs outside any transaction so no database transaction is held open
+    across the call to Stripe. The response is stored on ``record`` for
+    replay once the intent exists.
+    """
+    try:
+        client_secret = _create_stripe_intent(payment)
+    except stripe.error.StripeError as e:
+        logger.error(f"Stripe payment intent failed for payment {payment.id}: {str(e)}")
+        if record is None:
+            # Without an idempotency key the client cannot resume this payment
+            payment.status = 'failed'
+            payment.save(update_fields=['status', 'updated_at'])
+        return Response({'error': 'Payment provider error'}, status=status.HTTP_502_BAD_GATEWAY)
+
+    response_data = {
+        'payment_id': str(payment.id),
+        'client_secret': client_secret,
+        'amount': str(payment.amount),
+        'currency': payment.currency
+    }
+    if record is not None:
+        record.response = response_data
+        record.save(update_fields=['response', 'updated_at'])
+    return Response(response_data)
+
+
 @api_view(['POST'])
 @permission_classes([permissions.IsAuthenticated])
 def create_payment_intent(request):
     """
     Create a Stripe payment intent.
+
+    Requests sent with an ``Idempotency-Key`` header are safe to retry:
+    repeating the same request returns the intent created the first time,
+    and a retry after a payment provider error resumes the same payment.
     """
-    # This is a simplified version - in production you'd integrate with Stripe
-    amount = request.data.get('amount')
+    idempotency_key = request.headers.get('Idempotency-Key')
+    request_hash = hashlib.sha256(
+        json.dumps(request.data, sort_keys=True, default=str).encode()
+    ).hexdigest()
+
+    if idempotency_key:
+        record = (
+            IdempotencyKey.objects.filter(user=request.user, key=idempotency_key)
+            .select_related('payment').first()
+        )
+        if record:
+            return _resume_idempotent_request(record, request_hash)
+
     currency = request.data.get('currency', 'USD')
-    
-    if not amount:
-        return Response({'error': 'Amount is required'}, status=status.HTTP_400_BAD_REQUEST)
-    
-    # Create payment record
-    payment = Payment.objects.create(
-        user=request.user,
-        amount=amount,
-        currency=currency,
-        description=request.data.get('description', '')
+    boost_package = None
+    product = None
+
+    boost_package_id = request.data.get('boost_package')
+    if boost_package_id:
+        try:
+            boost_package = BoostPackage.objects.get(id=boost_package_id, is_active=True)
+            product = Product.objects.get(id=request.data.get('product'), seller=request.user)
+        except (BoostPackage.DoesNotExist, Product.DoesNotExist, ValidationError, ValueError):
+            return Response(
+                {'error': 'Valid boost package and product are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        amount = boost_package.price
+    else:
+        amount = request.data.get('amount')
+        if not amount:
+            return Response({'error': 'Amount is required'}, status=status.HTTP_400_BAD_REQUEST)
+        try:
+            amount = Decimal(str(amount))
+        except InvalidOperation:
+            return Response({'error': 'Invalid amount'}, status=status.HTTP_400_BAD_REQUEST)
+
+    record = None
+    try:
+        with transaction.atomic():
+            # Create payment record
+            payment = Payment.objects.create(
+                user=request.user,
+                product=product,
+                boost_package=boost_package,
+                amount=amount,
+                currency=currency,
+                description=request.data.get('description', '')
+            )
+            if idempotency_key:
+                # An empty response marks a request whose intent is not created yet
+                record = IdempotencyKey.objects.create(
+                    user=request.user,
+                    key=idempotency_key,
+                    request_hash=request_hash,
+                    payment=payment,
+                    response={},
+                )
+    except IntegrityError:
+        if not idempotency_key:
+            raise
+        # A concurrent retry with the same key won the race
+        record = IdempotencyKey.objects.select_related('payment').get(
+            user=request.user, key=idempotency_key
+        )
+        return _resume_idempotent_request(record, request_hash)
+
+    return _complete_payment_intent(payment, record)
+
+
+def _resume_idempotent_request(record, request_hash):
+    """
+    Answer a retried request, finishing it if its intent was never created.
+    """
+    if record.request_hash == request_hash and not record.response:
+        return _complete_payment_intent(record.payment, record)
+    return _replay_idempotent_response(record, request_hash)
+
+
+def _payment_for_stripe_object(obj):
+    """
+    Find the Payment a PaymentIntent or Charge object belongs to.
+    """
+    if obj.get('object') == 'payment_intent':
+        intent_id = obj.get('id')
+    else:
+        intent_id = obj.get('payment_intent')
+
+    payment = None
+    if intent_id:
+        payment = Payment.objects.filter(stripe_payment_intent_id=intent_id).first()
+    if payment is None:
+        payment_id = (obj.get('metadata') or {}).get('payment_id')
+        if payment_id:
+            payment = Payment.objects.filter(id=payment_id).first()
+    return payment
+
+
+def _schedule_payment_events(payment_id):
+    """
+    Ask a worker to apply a payment's pending Stripe events.
+
+    If the broker is unavailable the periodic sweep applies them later.
+    """
+    from .tasks import process_payment_events
+
+    try:
+        process_payment_events.delay(payment_id)
+    except Exception as e:
+        logger.warning(f"Could not schedule Stripe event processing: {str(e)}")
+
+
+@api_view(['POST'])
+@authentication_classes([])
+@permission_classes([permissions.AllowAny])
+@throttle_classes([])
+def stripe_webhook(request):
+    """
+    Receive Stripe webhook events.
+
+    Events are verified, stored and acknowledged immediately; they are
+    applied to their payment by a background task, in order.
+    """
+    if not settings.STRIPE_WEBHOOK_SECRET:
+        logger.error("Stripe webhook secret not configured")
+        return Response({'error': 'Webhook not configured'}, status=status.HTTP_400_BAD_REQUEST)
+
+    payload = request.body
+    try:
+        stripe.Webhook.construct_event(
+            payload,
+            request.META.get('HTTP_STRIPE_SIGNATURE', ''),
+            settings.STRIPE_WEBHOOK_SECRET,
+        )
+    except (ValueError, stripe.error.SignatureVerificationError) as e:
+        logger.warning(f"Rejected Stripe webhook: {str(e)}")
+        return Response({'error': 'Invalid signature'}, status=status.HTTP_400_BAD_REQUEST)
+
+    event = json.loads(payload)
+    payment = _payment_for_stripe_object(event['data']['object'])
+
+    stripe_event, created = StripeEvent.objects.get_or_create(
+        event_id=event['id'],
+        defaults={
+            'event_type': event['type'],
+            'stripe_created': datetime.fromtimestamp(event['created'], tz=dt_timezone.utc),
+            'payload': event,
+            'payment': payment,
+            'status': 'pending' if payment else 'ignored',
+        }
     )
-    
-    return Response({
-        'payment_id': payment.id,
-        'client_secret': f'demo_secret_{payment.id}',
-        'amount': amount,
-        'currency': currency
-    })
\ No newline at end of file
+
+    if created and payment:
+        transaction.on_commit(lambda: _schedule_payment_events(str(payment.id)))
+
+    return Response({'received': True})
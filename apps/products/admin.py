@@ -2,7 +2,9 @@
 Admin configuration for products app.
 """
 from django.contrib import admin
-from .models import Product, ProductImage, ProductLike
+from apps.core.admin import LargeTableAdminMixin, RawIdFieldListFilter, SoftDeleteAdmin
+from apps.core.exports import ExportAdminMixin
+from .models import PRODUCT_SEARCH_VECTOR, Product, ProductImage, ProductLike
 
 
 class ProductImageInline(admin.TabularInline):
@@ -12,18 +14,39 @@ class ProductImageInline(admin.TabularInline):
 
 
 @admin.register(Product)
-class ProductAdmin(admin.ModelAdmin):
+class ProductAdmin(LargeTableAdminMixin, ExportAdminMixin, SoftDeleteAdmin):
     list_display = (
         'title', 'seller', 'category', 'price', 'condition', 
         'is_active', 'is_sold', 'is_featured', 'views', 'created_at'
     )
     list_filter = (
         'condition', 'is_active', 'is_sold', 'is_featured', 'is_boosted',
-        'category', 'created_at'
+        ('category', RawIdFieldListFilter), ('seller', RawIdFieldListFilter), 'created_at'
     )
-    search_fields = ('title', 'description', 'seller__email', 'seller__username')
+    list_select_related = ('seller', 'category')
+    autocomplete_fields = ('seller', 'category')
+    search_fields = ('title', 'description')
+    search_vector = PRODUCT_SEARCH_VECTOR
     readonly_fields = ('views', 'likes', 'created_at', 'updated_at')
     inlines = [ProductImageInline]
+    export_columns = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('price', 'price'),
+        ('condition', 'condition'),
+        ('category', 'category__slug'),
+        ('seller', 'seller_id'),
+        ('seller_email', 'seller__email'),
+        ('location', 'location'),
+        ('is_active', 'is_active'),
+        ('is_sold', 'is_sold'),
+        ('is_featured', 'is_featured'),
+        ('is_boosted', 'is_boosted'),
+        ('is_deleted', 'is_deleted'),
+        ('views', 'views'),
+        ('likes', 'likes'),
+        ('created_at', 'created_at'),
+    )
     
     fieldsets = (
         ('Basic Information', {
@@ -51,14 +74,14 @@ class ProductAdmin(admin.ModelAdmin):
 
 
 @admin.register(ProductImage)
-class ProductImageAdmin(admin.ModelAdmin):
+class ProductImageAdmin(SoftDeleteAdmin):
     list_display = ('product', 'alt_text', 'order', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('product__title', 'alt_text')
 
 
 @admin.register(ProductLike)
-class ProductLikeAdmin(admin.ModelAdmin):
+class ProductLikeAdmin(SoftDeleteAdmin):
     list_display = ('product', 'user', 'created_at')
     list_filter = ('created_at',)
     search_fields = ('product__title', 'user__email')
\ No newline at end of file
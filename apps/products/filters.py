@@ -2,6 +2,7 @@
 Filters for products app.
 """
 import django_filters
+from rest_framework.filters import OrderingFilter
 from .models import Product
 
 
@@ -18,4 +19,21 @@ class ProductFilter(django_filters.FilterSet):
     
     class Meta:
         model = Product
-        fields = ['min_price', 'max_price', 'category', 'condition', 'location', 'is_featured']
\ No newline at end of file
+        fields = ['min_price', 'max_price', 'category', 'condition', 'location', 'is_featured']
+
+
+class BoostedFirstOrderingFilter(OrderingFilter):
+    """
+    Ordering filter that ranks boosted products first when
+    ``?boosted_first=true`` is passed. The default feed is unchanged.
+    """
+    boosted_first_param = 'boosted_first'
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        boosted_first = request.query_params.get(self.boosted_first_param, '')
+        if ordering and boosted_first.lower() in ('1', 'true', 'yes'):
+            ordering = ['-is_boosted'] + [
+                field for field in ordering if field.lstrip('-') != 'is_boosted'
+            ]
+        return ordering
\ No newline at end of file
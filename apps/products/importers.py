@@ -0,0 +1,311 @@
+"""
+Bulk product import for New Revolution.
+
+Rows are read from CSV or JSONL streams one at a time, validated, and
+written in chunks with ``bulk_create``, one transaction per chunk. Invalid
+rows (and every row of a chunk that fails to save) are reported with their
+row number; they never abort the rest of the import.
+"""
+import codecs
+import csv
+import json
+import posixpath
+from collections import Counter
+from decimal import Decimal
+from django.conf import settings
+from django.contrib.contenttypes.models import ContentType
+from django.core.files.storage import default_storage
+from django.db import DatabaseError, transaction
+from django.db.models.functions import Lower
+from rest_framework import serializers
+from taggit.models import Tag
+from apps.categories.models import Category
+from apps.core.cache import bump_model_version
+from .models import Product, ProductImage, ProductTaggedItem
+from .tags import adjust_tag_usage
+import logging
+
+logger = logging.getLogger(__name__)
+
+FORMATS = ('csv', 'jsonl')
+
+# CSV cells holding several tags or image references separate them with this
+CSV_LIST_SEPARATOR = '|'
+
+
+class DelimitedListField(serializers.ListField):
+    """
+    List field that also accepts a ``|`` separated string, as found in CSV.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [item.strip() for item in data.split(CSV_LIST_SEPARATOR) if item.strip()]
+        return super().to_internal_value(data)
+
+
+class ProductImportRowSerializer(serializers.Serializer):
+    """
+    Validate one imported product row.
+
+    ``category`` is a category slug or name, resolved through the
+    ``categories`` map in the serializer context. ``images`` are references
+    to files the seller already uploaded to media storage, under the
+    ``image_prefix`` in the serializer context.
+    """
+    title = serializers.CharField(max_length=255)
+    description = serializers.CharField()
+    price = serializers.DecimalField(max_digits=10, decimal_places=2, min_value=Decimal('0.01'))
+    condition = serializers.ChoiceField(choices=Product.CONDITION_CHOICES, default='used')
+    category = serializers.CharField()
+    location = serializers.CharField(max_length=255, required=False, allow_blank=True, default='')
+    tags = DelimitedListField(
+        child=serializers.CharField(max_length=100), required=False, default=list
+    )
+    images = DelimitedListField(
+        child=serializers.CharField(
+            max_length=ProductImage._meta.get_field('image').max_length
+        ),
+        required=False,
+        default=list,
+        max_length=10,
+    )
+
+    def validate_category(self, value):
+        category_id = self.context['categories'].get(value.strip().lower())
+        if category_id is None:
+            raise serializers.ValidationError(f"Unknown category '{value}'.")
+        return category_id
+
+    def validate_images(self, value):
+        prefix = self.context['image_prefix']
+        names = []
+        for name in value:
+            normalized = posixpath.normpath(name)
+            if (
+                '\\' in name or name.startswith('/') or '..' in name.split('/')
+                or not normalized.startswith(prefix)
+            ):
+                raise serializers.ValidationError(
+                    f"Image '{name}' must be a file under '{prefix}'."
+                )
+            names.append(normalized)
+        return names
+
+    def validate_tags(self, value):
+        # Tags are case insensitive, keep the first spelling of each
+        tags = {}
+        for name in value:
+            tags.setdefault(name.lower(), name)
+        return list(tags.values())
+
+
+def import_image_prefix(seller):
+    """
+    Return the media storage directory a seller uploads import images to.
+    """
+    return f'imports/{seller.pk}/'
+
+
+def read_rows(stream, file_format):
+    """
+    Yield ``(row_number, data)`` pairs from a binary CSV or JSONL stream.
+
+    ``data`` is None for lines that cannot be parsed. CSV rows are numbered
+    from 1 after the header line.
+    """
+    if file_format not in FORMATS:
+        raise ValueError(f"Unsupported import format '{file_format}'")
+
+    lines = codecs.iterdecode(stream, 'utf-8-sig')
+    if file_format == 'csv':
+        for number, row in enumerate(csv.DictReader(lines), start=1):
+            yield number, row
+        return
+
+    for number, line in enumerate(lines, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        yield number, data if isinstance(data, dict) else None
+
+
+class ProductImporter:
+    """
+    Import products for one seller.
+
+    Categories are loaded once into a slug/name lookup map and tags are
+    resolved per chunk into a map that persists across chunks, so a chunk
+    costs a fixed number of queries whatever its size. ``PRODUCT_IMPORT_MAX_ERRORS``
+    caps how many row errors are kept for the report. Image references must
+    point at existing files under the seller's ``image_prefix``.
+    """
+
+    def __init__(self, seller, chunk_size=None, dry_run=False):
+        self.seller = seller
+        self.chunk_size = chunk_size or getattr(settings, 'PRODUCT_IMPORT_CHUNK_SIZE', 500)
+        self.max_errors = getattr(settings, 'PRODUCT_IMPORT_MAX_ERRORS', 1000)
+        self.dry_run = dry_run
+        self.created = 0
+        self.failed = 0
+        self.errors = []
+        self.tag_ids = {}
+        self.image_prefix = import_image_prefix(seller)
+        # Image names already found in storage
+        self.existing_images = set()
+        self.categories = {}
+        for category_id, slug, name in Category.objects.filter(
+            is_active=True
+        ).values_list('id', 'slug', 'name'):
+            self.categories[slug.lower()] = category_id
+            self.categories[name.lower()] = category_id
+        self.content_type = ContentType.objects.get_for_model(Product)
+
+    def run(self, rows):
+        """
+        Import ``(row_number, data)`` pairs, as yielded by ``read_rows``.
+        """
+        context = {'categories': self.categories, 'image_prefix': self.image_prefix}
+        chunk = []
+        for number, data in rows:
+            if data is None:
+                self.add_error(number, {'non_field_errors': ['Row could not be parsed.']})
+                continue
+            serializer = ProductImportRowSerializer(data=data, context=context)
+            if not serializer.is_valid():
+                self.add_error(number, serializer.errors)
+                continue
+            chunk.append((number, serializer.validated_data))
+            if len(chunk) >= self.chunk_size:
+                self.write_chunk(chunk)
+                chunk = []
+        if chunk:
+            self.write_chunk(chunk)
+        return self.report()
+
+    def add_error(self, number, errors):
+        self.failed += 1
+        if len(self.errors) < self.max_errors:
+            self.errors.append({'row': number, 'errors': errors})
+
+    def report(self):
+        return {
+            'created': self.created,
+            'failed': self.failed,
+            'dry_run': self.dry_run,
+            'errors': self.errors,
+        }
+
+    def check_images(self, chunk):
+        """
+        Drop rows referencing images missing from storage, reporting them.
+
+        Each distinct name in the chunk is checked once per import.
+        """
+        names = {name for _, data in chunk for name in data['images']} - self.existing_images
+        missing = set()
+        for name in names:
+            if default_storage.exists(name):
+                self.existing_images.add(name)
+            else:
+                missing.add(name)
+        if not missing:
+            return chunk
+
+        found = []
+        for number, data in chunk:
+            absent = [name for name in data['images'] if name in missing]
+            if absent:
+                self.add_error(number, {'images': [f"Image '{name}' does not exist." for name in absent]})
+            else:
+                found.append((number, data))
+        return found
+
+    def write_chunk(self, chunk):
+        chunk = self.check_images(chunk)
+        if not chunk:
+            return
+        if self.dry_run:
+            self.created += len(chunk)
+            return
+        try:
+            with transaction.atomic():
+                self.save_chunk([data for _, data in chunk])
+        except DatabaseError as e:
+            logger.error(f"Product import chunk failed for seller {self.seller.pk}: {str(e)}")
+            # Tags created in the rolled back transaction no longer exist
+            self.tag_ids = {}
+            for number, _ in chunk:
+                self.add_error(number, {'non_field_errors': ['Row could not be saved.']})
+            return
+        # bulk_create skips the post_save signal that refreshes category counts
+        bump_model_version(Product)
+        self.created += len(chunk)
+
+    def save_chunk(self, rows):
+        products = Product.objects.bulk_create([
+            Product(
+                seller=self.seller,
+                title=data['title'],
+                description=data['description'],
+                price=data['price'],
+                condition=data['condition'],
+                category_id=data['category'],
+                location=data['location'],
+            )
+            for data in rows
+        ])
+
+        ProductImage.objects.bulk_create([
+            ProductImage(product=product, image=name, alt_text=product.title[:255], order=order)
+            for product, data in zip(products, rows)
+            for order, name in enumerate(data['images'])
+        ])
+
+        self.resolve_tags({name for data in rows for name in data['tags']})
+        tagged_items = ProductTaggedItem.objects.bulk_create([
+            ProductTaggedItem(
+                content_type=self.content_type,
+                object_id=product.pk,
+                tag_id=self.tag_ids[name.lower()],
+            )
+            for product, data in zip(products, rows)
+            for name in data['tags']
+        ])
+        # bulk_create skips the m2m_changed signal that maintains tag usage
+        adjust_tag_usage(Counter(item.tag_id for item in tagged_items))
+
+    def resolve_tags(self, names):
+        """
+        Add the ids of ``names`` to the tag map, creating missing tags.
+        """
+        missing = {name.lower(): name for name in names if name.lower() not in self.tag_ids}
+        if not missing:
+            return
+
+        self.tag_ids.update(self._existing_tags(missing))
+        new_tags = [Tag(name=name) for key, name in missing.items() if key not in self.tag_ids]
+        if not new_tags:
+            return
+
+        for tag in new_tags:
+            tag.slug = tag.slugify(tag.name)
+        Tag.objects.bulk_create(new_tags, ignore_conflicts=True)
+        self.tag_ids.update(self._existing_tags(missing))
+
+        # Names whose slug clashed with another tag go through taggit's
+        # own slug deduplication
+        for key, name in missing.items():
+            if key not in self.tag_ids:
+                self.tag_ids[key] = Tag.objects.create(name=name).pk
+
+    def _existing_tags(self, names):
+        return dict(
+            Tag.objects.annotate(lower_name=Lower('name'))
+            .filter(lower_name__in=list(names))
+            .values_list('lower_name', 'id')
+        )
\ No newline at end of file
@@ -0,0 +1 @@
+# Products management
\ No newline at end of file
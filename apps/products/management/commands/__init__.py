@@ -0,0 +1 @@
+# Products management commands
\ No newline at end of file
@@ -0,0 +1,54 @@
+"""
+Bulk import a seller's products from a CSV or JSONL file.
+"""
+import json
+import sys
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from apps.accounts.models import User
+from apps.products.importers import FORMATS, ProductImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Bulk import products for a seller from a CSV or JSONL file.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import, or '-' for stdin.")
+        parser.add_argument('--seller', required=True, help='Username or email of the seller.')
+        parser.add_argument('--format', choices=FORMATS,
+                            help='File format; defaults to the file extension.')
+        parser.add_argument('--chunk-size', type=int,
+                            help='Rows per transaction (PRODUCT_IMPORT_CHUNK_SIZE).')
+        parser.add_argument('--dry-run', action='store_true',
+                            help='Validate rows without saving them.')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in FORMATS:
+            raise CommandError(f"Cannot tell the format of '{path}', pass --format")
+
+        try:
+            seller = User.objects.get(
+                Q(username=options['seller']) | Q(email=options['seller'])
+            )
+        except User.DoesNotExist:
+            raise CommandError(f"Seller '{options['seller']}' not found")
+
+        importer = ProductImporter(
+            seller, chunk_size=options['chunk_size'], dry_run=options['dry_run']
+        )
+        if path == '-':
+            report = importer.run(read_rows(sys.stdin.buffer, file_format))
+        else:
+            try:
+                with open(path, 'rb') as stream:
+                    report = importer.run(read_rows(stream, file_format))
+            except OSError as e:
+                raise CommandError(str(e))
+
+        for error in report['errors']:
+            self.stderr.write(json.dumps(error))
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {report['created']} products, {report['failed']} rows failed"
+        ))
\ No newline at end of file
@@ -1,14 +1,62 @@
 """
 Product models for New Revolution marketplace.
 """
+from datetime import timedelta
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVector
 from django.db import models
+from django.db.models import Q
+from django.utils import timezone
 from django.core.validators import MinValueValidator, MaxValueValidator
-from apps.core.models import BaseModel, SEOModel, PublishableModel
+from apps.core.models import BaseModel, SEOModel, PublishableModel, TimeStampedModel
 from apps.core.utils import generate_product_image_path
 from taggit.managers import TaggableManager
+from taggit.models import GenericUUIDTaggedItemBase, TaggedItemBase
 from mptt.models import MPTTModel, TreeForeignKey
 import uuid
 
+# Full-text search document of a product, indexed by products_search_idx
+PRODUCT_SEARCH_VECTOR = SearchVector('title', 'description', config='english')
+
+
+class ProductTaggedItem(GenericUUIDTaggedItemBase, TaggedItemBase):
+    """
+    Tag assignment for products, whose primary keys are UUIDs.
+    """
+
+    class Meta:
+        db_table = 'product_tagged_items'
+        verbose_name = 'Product Tag'
+        verbose_name_plural = 'Product Tags'
+        indexes = [
+            # Products of a tag come from this index alone
+            models.Index(fields=['tag', 'object_id'], name='product_tagged_items_tag_idx'),
+        ]
+
+
+class TagUsage(models.Model):
+    """
+    Number of products carrying a tag, kept up to date as tags change.
+    """
+    tag = models.OneToOneField(
+        'taggit.Tag',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='product_usage'
+    )
+    product_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = 'product_tag_usage'
+        verbose_name = 'Tag Usage'
+        verbose_name_plural = 'Tag Usage'
+        indexes = [
+            models.Index(fields=['-product_count'], name='product_tag_usage_count_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tag_id}: {self.product_count}"
+
 
 class Product(BaseModel, SEOModel, PublishableModel):
     """
@@ -70,7 +118,7 @@ class Product(BaseModel, SEOModel, PublishableModel):
     likes = models.PositiveIntegerField(default=0)
     
     # Tags
-    tags = TaggableManager(blank=True)
+    tags = TaggableManager(through=ProductTaggedItem, blank=True)
 
     class Meta:
         db_table = 'products'
@@ -78,12 +126,35 @@ class Product(BaseModel, SEOModel, PublishableModel):
         verbose_name_plural = 'Products'
         ordering = ['-created_at']
         indexes = [
-            models.Index(fields=['seller', 'is_active']),
-            models.Index(fields=['category', 'is_active']),
+            models.Index(
+                fields=['seller', '-created_at'],
+                name='products_live_seller_idx',
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['category', 'is_active'],
+                name='products_live_category_idx',
+                condition=Q(is_deleted=False),
+            ),
             models.Index(fields=['price']),
             models.Index(fields=['created_at']),
-            models.Index(fields=['is_featured', 'is_active']),
+            models.Index(
+                fields=['-created_at'],
+                name='products_live_featured_idx',
+                condition=Q(is_featured=True, is_active=True, is_deleted=False),
+            ),
             models.Index(fields=['is_boosted', 'boost_expires_at']),
+            models.Index(
+                fields=['-is_boosted', '-created_at'],
+                name='products_boosted_feed_idx',
+                condition=Q(is_active=True, is_deleted=False),
+            ),
+            models.Index(
+                fields=['boost_expires_at'],
+                name='products_active_boosts_idx',
+                condition=Q(is_boosted=True),
+            ),
+            GinIndex(PRODUCT_SEARCH_VECTOR, name='products_search_idx'),
         ]
 
     def __str__(self):
@@ -110,6 +181,16 @@ class Product(BaseModel, SEOModel, PublishableModel):
         self.is_active = False
         self.save(update_fields=['is_sold', 'is_active'])
 
+    def boost(self, duration_days):
+        """Boost the product, extending any boost that is still running."""
+        now = timezone.now()
+        start = now
+        if self.is_boosted and self.boost_expires_at and self.boost_expires_at > now:
+            start = self.boost_expires_at
+        self.is_boosted = True
+        self.boost_expires_at = start + timedelta(days=duration_days)
+        self.save(update_fields=['is_boosted', 'boost_expires_at', 'updated_at'])
+
 
 class ProductImage(BaseModel):
     """
@@ -129,6 +210,13 @@ class ProductImage(BaseModel):
         verbose_name = 'Product Image'
         verbose_name_plural = 'Product Images'
         ordering = ['order', 'created_at']
+        indexes = [
+            models.Index(
+                fields=['product', 'order', 'created_at'],
+                name='product_images_live_idx',
+                condition=Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return f"Image for {self.product.title}"
@@ -153,7 +241,57 @@ class ProductLike(BaseModel):
         db_table = 'product_likes'
         verbose_name = 'Product Like'
         verbose_name_plural = 'Product Likes'
-        unique_together = ('product', 'user')
+        constraints = [
+            # Unliking soft deletes the like, so only live likes are unique
+            models.UniqueConstraint(
+                fields=['product', 'user'],
+                condition=Q(is_deleted=False),
+                name='product_likes_live_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.user.display_name} likes {self.product.title}"
+
+
+class BoostExpiry(TimeStampedModel):
+    """
+    Due-queue entry for a product boost, grouped into time buckets.
+
+    The expiry task reads due buckets from this table instead of scanning
+    products, so its cost follows the number of boosts rather than the
+    number of listings.
+    """
+    BUCKET_SECONDS = 60
+
+    product = models.OneToOneField(
+        Product,
+        on_delete=models.CASCADE,
+        related_name='boost_expiry'
+    )
+    expires_at = models.DateTimeField()
+    bucket = models.BigIntegerField(db_index=True)
+
+    class Meta:
+        db_table = 'product_boost_expiries'
+        verbose_name = 'Boost Expiry'
+        verbose_name_plural = 'Boost Expiries'
 
     def __str__(self):
-        return f"{self.user.display_name} likes {self.product.title}"
\ No newline at end of file
+        return f"Boost for {self.product_id} expires at {self.expires_at}"
+
+    @classmethod
+    def bucket_for(cls, when):
+        """Return the time bucket a datetime falls into."""
+        return int(when.timestamp()) // cls.BUCKET_SECONDS
+
+    @classmethod
+    def schedule(cls, product):
+        """Queue (or move) the expiry of a product's boost."""
+        return cls.objects.update_or_create(
+            product=product,
+            defaults={
+                'expires_at': product.boost_expires_at,
+                'bucket': cls.bucket_for(product.boost_expires_at),
+            }
+        )
\ No newline at end of file
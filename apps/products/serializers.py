@@ -1,9 +1,90 @@
 """
 Serializers for products app.
 """
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import transaction
 from rest_framework import serializers
 from .models import Product, ProductImage, ProductLike
 from apps.categories.serializers import CategorySerializer
+from apps.core.serializers import (
+    ValuesSerializer, datetime_string, decimal_string, display_name
+)
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+def upload_product_images(product, uploaded_images, start_order=0):
+    """
+    Upload product images concurrently and return their unsaved rows.
+
+    Storage uploads run in a bounded thread pool. If any upload fails, files
+    that already reached storage are deleted before the error is re-raised.
+    The product does not need to be saved yet, so callers can keep the
+    uploads outside of their transaction.
+    """
+    if not uploaded_images:
+        return []
+
+    field = ProductImage._meta.get_field('image')
+    storage = field.storage
+    images = [
+        ProductImage(product=product, order=start_order + index)
+        for index, _ in enumerate(uploaded_images)
+    ]
+
+    def upload(image, uploaded_file):
+        name = field.generate_filename(image, uploaded_file.name)
+        return storage.save(name, uploaded_file, max_length=field.max_length)
+
+    max_workers = min(getattr(settings, 'IMAGE_UPLOAD_MAX_WORKERS', 4), len(images))
+    uploaded = []
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(upload, image, uploaded_file)
+            for image, uploaded_file in zip(images, uploaded_images)
+        ]
+        errors = []
+        for image, future in zip(images, futures):
+            try:
+                image.image = future.result()
+                uploaded.append(image)
+            except Exception as e:
+                errors.append(e)
+    if errors:
+        delete_product_image_files(uploaded)
+        raise errors[0]
+    return images
+
+
+def delete_product_image_files(images):
+    """
+    Delete the stored files of product images whose rows were not saved.
+    """
+    for image in images:
+        name = image.image.name
+        try:
+            image.image.storage.delete(name)
+        except Exception as e:
+            logger.error(f"Failed to clean up product image {name}: {str(e)}")
+
+
+def create_product_images(product, uploaded_images, start_order=0):
+    """
+    Upload product images concurrently and insert their rows in one query.
+
+    Rows are only written once every upload has succeeded; if the insert
+    fails, the uploaded files are deleted before the error is re-raised.
+    """
+    images = upload_product_images(product, uploaded_images, start_order)
+    if not images:
+        return []
+    try:
+        return ProductImage.objects.bulk_create(images)
+    except Exception:
+        delete_product_image_files(images)
+        raise
 
 
 class ProductImageSerializer(serializers.ModelSerializer):
@@ -63,19 +144,25 @@ class ProductSerializer(serializers.ModelSerializer):
         # Set seller to current user
         validated_data['seller'] = self.context['request'].user
         
-        product = Product.objects.create(**validated_data)
-        
-        # Add tags
-        if tags:
-            product.tags.set(tags)
-        
-        # Create product images
-        for index, image in enumerate(uploaded_images):
-            ProductImage.objects.create(
-                product=product,
-                image=image,
-                order=index
-            )
+        # Upload images before opening the transaction, so it is not held
+        # open across the storage round trips
+        product = Product(**validated_data)
+        images = upload_product_images(product, uploaded_images)
+
+        try:
+            with transaction.atomic():
+                product.save(force_insert=True)
+
+                # Add tags
+                if tags:
+                    product.tags.set(tags)
+
+                # Create product images
+                if images:
+                    ProductImage.objects.bulk_create(images)
+        except Exception:
+            delete_product_image_files(images)
+            raise
         
         return product
 
@@ -95,12 +182,7 @@ class ProductSerializer(serializers.ModelSerializer):
         # Add new images if provided
         if uploaded_images:
             current_count = instance.images.count()
-            for index, image in enumerate(uploaded_images):
-                ProductImage.objects.create(
-                    product=instance,
-                    image=image,
-                    order=current_count + index
-                )
+            create_product_images(instance, uploaded_images, start_order=current_count)
         
         return instance
 
@@ -132,6 +214,49 @@ class ProductListSerializer(serializers.ModelSerializer):
         return None
 
 
+class ProductListValuesSerializer(ValuesSerializer):
+    """
+    Fast path producing the same output as ProductListSerializer.
+    """
+    field_map = (
+        ('id', 'id', None),
+        ('title', 'title', None),
+        ('price', 'price', decimal_string(2)),
+        ('condition', 'condition', None),
+        ('category_name', 'category__name', None),
+        ('seller_name', ('seller__first_name', 'seller__last_name', 'seller__username'), display_name),
+        ('location', 'location', None),
+        ('is_featured', 'is_featured', None),
+        ('is_boosted', 'is_boosted', None),
+        ('views', 'views', None),
+        ('likes', 'likes', None),
+        ('main_image', 'id', 'get_main_image'),
+        ('created_at', 'created_at', datetime_string),
+    )
+
+    def prepare(self, rows):
+        """Load the first image of every product on the page in one query."""
+        id_index = self.lookups.index('id')
+        product_ids = [row[id_index] for row in rows]
+        images = (
+            ProductImage.objects.filter(product_id__in=product_ids)
+            .order_by('product_id', 'order', 'created_at')
+            .distinct('product_id')
+            .values_list('product_id', 'image')
+        )
+        self._main_images = dict(images)
+
+    def get_main_image(self, product_id):
+        name = self._main_images.get(product_id)
+        if not name:
+            return None
+        url = ProductImage._meta.get_field('image').storage.url(name)
+        request = self.context.get('request')
+        if request:
+            return request.build_absolute_uri(url)
+        return url
+
+
 class ProductLikeSerializer(serializers.ModelSerializer):
     """
     Serializer for product likes.
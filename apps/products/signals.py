@@ -0,0 +1,80 @@
+"""
+Signals for products app.
+"""
+from django.db.models.signals import m2m_changed, post_save, post_delete
+from django.dispatch import receiver
+from apps.core.cache import bump_model_version, bump_object_version, bump_object_versions
+from apps.core.signals import soft_deleted, restored
+from .models import Product, BoostExpiry, ProductTaggedItem
+from .tags import adjust_tag_usage, tag_counts_for_products
+
+BOOST_FIELDS = {'is_boosted', 'boost_expires_at'}
+
+# Counter updates that cached list responses may show stale until they expire
+COUNTER_FIELDS = {'views', 'likes'}
+
+
+@receiver(post_save, sender=Product)
+def schedule_boost_expiry(sender, instance, update_fields=None, **kwargs):
+    """
+    Queue the boost expiry whenever a product's boost is set or extended.
+    """
+    if update_fields is not None and not BOOST_FIELDS & set(update_fields):
+        return
+
+    if instance.is_boosted and instance.boost_expires_at:
+        BoostExpiry.schedule(instance)
+
+
+@receiver(post_save, sender=Product)
+@receiver(post_delete, sender=Product)
+def invalidate_product_responses(sender, instance, update_fields=None, **kwargs):
+    """
+    Mark cached list responses containing this product as stale.
+
+    Also bumps the Product catalog version, which keys the cached category
+    responses and their product counts.
+    """
+    if update_fields is not None and set(update_fields) <= COUNTER_FIELDS:
+        return
+    bump_object_version(Product, instance.pk)
+    bump_model_version(Product)
+
+
+@receiver(soft_deleted, sender=Product)
+@receiver(restored, sender=Product)
+def invalidate_product_responses_in_bulk(sender, pks, **kwargs):
+    """
+    Mark cached list responses as stale after queryset soft deletes and restores.
+    """
+    bump_object_versions(Product, pks)
+    bump_model_version(Product)
+
+
+@receiver(m2m_changed, sender=ProductTaggedItem)
+def update_tag_usage(sender, instance, action, pk_set, **kwargs):
+    """
+    Keep tag usage counters in step with ``product.tags`` changes.
+    """
+    if instance.is_deleted:
+        return
+    if action == 'pre_clear':
+        instance._cleared_tag_ids = list(
+            ProductTaggedItem.objects.filter(object_id=instance.pk).values_list('tag_id', flat=True)
+        )
+    elif action == 'post_clear':
+        adjust_tag_usage({tag_id: -1 for tag_id in getattr(instance, '_cleared_tag_ids', [])})
+    elif action in ('post_add', 'post_remove'):
+        delta = 1 if action == 'post_add' else -1
+        adjust_tag_usage({tag_id: delta for tag_id in pk_set or ()})
+
+
+@receiver(soft_deleted, sender=Product)
+@receiver(restored, sender=Product)
+def update_tag_usage_in_bulk(sender, pks, signal, **kwargs):
+    """
+    Count tags of soft-deleted products out, and of restored ones back in.
+    """
+    sign = -1 if signal is soft_deleted else 1
+    counts = tag_counts_for_products(pks)
+    adjust_tag_usage({tag_id: sign * count for tag_id, count in counts.items()})
\ No newline at end of file
@@ -0,0 +1,244 @@
+"""
+Tag usage counters and the tag autocomplete index.
+
+``TagUsage`` counts the live (not soft-deleted) products carrying each tag.
+Counters are adjusted as tags are added and removed and as products are
+soft deleted or restored, and recounted periodically to absorb drift.
+The autocomplete index mirrors them in Redis sorted sets when the cache
+is django-redis, or in a per-process index reloaded every
+``TAG_INDEX_LOCAL_TTL`` seconds otherwise.
+"""
+import bisect
+import functools
+import threading
+import time
+from collections import defaultdict
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F
+from taggit.models import Tag
+from .models import Product, ProductTaggedItem, TagUsage
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Prefix matches read from the lexicographic index before ranking by usage
+SUGGEST_SCAN_LIMIT = 200
+
+
+def _usage_rows():
+    """Return ``(tag_id, name, slug, product_count)`` for every used tag."""
+    return list(
+        TagUsage.objects.filter(product_count__gt=0)
+        .values_list('tag_id', 'tag__name', 'tag__slug', 'product_count')
+    )
+
+
+def _rank(entries, limit):
+    entries = [entry for entry in entries if entry['count'] > 0]
+    entries.sort(key=lambda entry: (-entry['count'], entry['name'].lower()))
+    return entries[:limit]
+
+
+class LocalTagIndex:
+    """
+    In-process tag index for deployments without Redis.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loaded_at = None
+        self._names = []
+        self._tags = {}
+
+    def _load(self):
+        ttl = getattr(settings, 'TAG_INDEX_LOCAL_TTL', 60)
+        if self._loaded_at is not None and time.monotonic() - self._loaded_at < ttl:
+            return
+        self.rebuild()
+
+    def rebuild(self):
+        tags = {
+            tag_id: {'name': name, 'slug': slug, 'count': count}
+            for tag_id, name, slug, count in _usage_rows()
+        }
+        names = sorted((tag['name'].lower(), tag_id) for tag_id, tag in tags.items())
+        with self._lock:
+            self._tags = tags
+            self._names = names
+            self._loaded_at = time.monotonic()
+
+    def apply(self, deltas):
+        with self._lock:
+            for tag_id, delta in deltas.items():
+                if tag_id in self._tags:
+                    self._tags[tag_id]['count'] += delta
+        # Tags new to this process appear at the next reload
+        if any(tag_id not in self._tags for tag_id in deltas):
+            self._loaded_at = None
+
+    def suggest(self, prefix, limit):
+        self._load()
+        prefix = prefix.lower()
+        with self._lock:
+            start = bisect.bisect_left(self._names, (prefix,))
+            matches = []
+            for name, tag_id in self._names[start:start + SUGGEST_SCAN_LIMIT]:
+                if not name.startswith(prefix):
+                    break
+                matches.append(dict(self._tags[tag_id]))
+        return _rank(matches, limit)
+
+    def top(self, limit):
+        self._load()
+        with self._lock:
+            return _rank([dict(tag) for tag in self._tags.values()], limit)
+
+
+class RedisTagIndex:
+    """
+    Tag index in Redis shared by every process.
+
+    Names live in a lexicographic sorted set (``ZRANGEBYLEX`` prefix
+    scans), usage in a sorted set scored by product count, and display
+    names and slugs in a hash.
+    """
+
+    def __init__(self, client):
+        self.client = client
+        self.names_key = cache.make_key('tags:names')
+        self.usage_key = cache.make_key('tags:usage')
+        self.info_key = cache.make_key('tags:info')
+        self.built_key = cache.make_key('tags:built')
+
+    def _ensure_built(self):
+        if not self.client.exists(self.built_key):
+            self.rebuild()
+
+    def rebuild(self):
+        rows = _usage_rows()
+        pipe = self.client.pipeline()
+        pipe.delete(self.names_key, self.usage_key, self.info_key)
+        if rows:
+            pipe.zadd(self.names_key, {f'{name.lower()}\x00{tag_id}': 0 for tag_id, name, _, _ in rows})
+            pipe.zadd(self.usage_key, {tag_id: count for tag_id, _, _, count in rows})
+            pipe.hset(self.info_key, mapping={
+                tag_id: f'{slug}\x00{name}' for tag_id, name, slug, _ in rows
+            })
+        pipe.set(self.built_key, 1)
+        pipe.execute()
+
+    def apply(self, deltas):
+        known = self.client.hmget(self.info_key, list(deltas))
+        pipe = self.client.pipeline()
+        new_ids = [tag_id for tag_id, info in zip(deltas, known) if info is None]
+        for tag_id, name, slug in Tag.objects.filter(pk__in=new_ids).values_list('id', 'name', 'slug'):
+            pipe.zadd(self.names_key, {f'{name.lower()}\x00{tag_id}': 0})
+            pipe.hset(self.info_key, tag_id, f'{slug}\x00{name}')
+        for tag_id, delta in deltas.items():
+            pipe.zincrby(self.usage_key, delta, tag_id)
+        pipe.execute()
+
+    def _entries(self, tag_ids, counts):
+        infos = self.client.hmget(self.info_key, tag_ids) if tag_ids else []
+        entries = []
+        for info, count in zip(infos, counts):
+            if info is None or count is None:
+                continue
+            slug, name = info.decode().split('\x00', 1)
+            entries.append({'name': name, 'slug': slug, 'count': int(count)})
+        return entries
+
+    def suggest(self, prefix, limit):
+        self._ensure_built()
+        prefix = prefix.lower()
+        low = f'[{prefix}'.encode()
+        members = self.client.zrangebylex(
+            self.names_key, low, low + b'\xff', start=0, num=SUGGEST_SCAN_LIMIT
+        )
+        tag_ids = [member.decode().rsplit('\x00', 1)[1] for member in members]
+        counts = self.client.zmscore(self.usage_key, tag_ids) if tag_ids else []
+        return _rank(self._entries(tag_ids, counts), limit)
+
+    def top(self, limit):
+        self._ensure_built()
+        pairs = self.client.zrevrangebyscore(
+            self.usage_key, '+inf', 1, start=0, num=limit, withscores=True
+        )
+        return _rank(self._entries([tag_id for tag_id, _ in pairs], [count for _, count in pairs]), limit)
+
+
+@functools.lru_cache(maxsize=None)
+def get_tag_index():
+    try:
+        from django_redis import get_redis_connection
+    except ImportError:
+        return LocalTagIndex()
+    try:
+        return RedisTagIndex(get_redis_connection('default'))
+    except NotImplementedError:
+        # The default cache is not a django-redis cache
+        return LocalTagIndex()
+
+
+def _apply_to_index(deltas):
+    try:
+        get_tag_index().apply(deltas)
+    except Exception as e:
+        logger.warning(f"Tag index update failed, it will catch up on recount: {str(e)}")
+
+
+def adjust_tag_usage(deltas):
+    """
+    Add ``deltas`` (tag id to change in product count) to the usage counters.
+
+    The index is updated once the surrounding transaction commits.
+    """
+    deltas = {tag_id: delta for tag_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+
+    TagUsage.objects.bulk_create(
+        [TagUsage(tag_id=tag_id) for tag_id in deltas], ignore_conflicts=True
+    )
+    by_delta = defaultdict(list)
+    for tag_id, delta in deltas.items():
+        by_delta[delta].append(tag_id)
+    for delta, tag_ids in by_delta.items():
+        TagUsage.objects.filter(tag_id__in=tag_ids).update(product_count=F('product_count') + delta)
+
+    transaction.on_commit(lambda: _apply_to_index(deltas))
+
+
+def tag_counts_for_products(product_ids):
+    """Return how many of ``product_ids`` carry each tag."""
+    return dict(
+        ProductTaggedItem.objects.filter(object_id__in=product_ids)
+        .values_list('tag_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+
+
+def recount_tag_usage():
+    """
+    Recount every tag's live products and rebuild the index.
+    """
+    counts = dict(
+        ProductTaggedItem.objects.filter(object_id__in=Product.objects.values('pk'))
+        .values_list('tag_id')
+        .annotate(count=Count('id'))
+        .order_by()
+    )
+    with transaction.atomic():
+        TagUsage.objects.exclude(product_count=0).update(product_count=0)
+        TagUsage.objects.bulk_create(
+            [TagUsage(tag_id=tag_id, product_count=count) for tag_id, count in counts.items()],
+            batch_size=1000,
+            update_conflicts=True,
+            unique_fields=['tag'],
+            update_fields=['product_count'],
+        )
+    get_tag_index().rebuild()
+    return len(counts)
\ No newline at end of file
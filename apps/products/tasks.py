@@ -0,0 +1,69 @@
+"""
+Background tasks for products app.
+"""
+from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from apps.core.cache import bump_object_versions
+from .models import Product, BoostExpiry
+from .tags import recount_tag_usage
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(ignore_result=True)
+def expire_product_boosts(batch_size=None):
+    """
+    Expire boosts whose deadline has passed, in batched UPDATEs.
+
+    Only due buckets of the BoostExpiry queue are read. A product that was
+    re-boosted after being queued keeps its boost because the UPDATE is
+    guarded on ``boost_expires_at``. Cached lists holding the products are
+    marked stale, as ``update()`` skips the post_save receivers.
+    """
+    batch_size = batch_size or getattr(settings, 'BOOST_EXPIRY_BATCH_SIZE', 500)
+    now = timezone.now()
+    current_bucket = BoostExpiry.bucket_for(now)
+    expired_count = 0
+
+    while True:
+        entries = list(
+            BoostExpiry.objects.filter(bucket__lte=current_bucket, expires_at__lte=now)
+            .order_by('bucket')
+            .values_list('id', 'product_id')[:batch_size]
+        )
+        if not entries:
+            break
+
+        product_ids = [product_id for _, product_id in entries]
+        with transaction.atomic():
+            expired_count += Product.all_objects.filter(
+                id__in=product_ids,
+                is_boosted=True,
+                boost_expires_at__lte=now,
+            ).update(is_boosted=False, updated_at=now)
+            BoostExpiry.objects.filter(
+                id__in=[entry_id for entry_id, _ in entries],
+                expires_at__lte=now,
+            ).delete()
+        bump_object_versions(Product, product_ids)
+
+        if len(entries) < batch_size:
+            break
+
+    if expired_count:
+        logger.info(f"Expired {expired_count} product boosts")
+    return expired_count
+
+
+
+@shared_task(ignore_result=True)
+def recount_tags():
+    """
+    Recount tag usage from the tag assignments and rebuild the tag index.
+    """
+    tag_count = recount_tag_usage()
+    logger.info(f"Recounted usage of {tag_count} tags")
+    return tag_count
\ No newline at end of file
@@ -0,0 +1,47 @@
+"""
+Tests for products app.
+"""
+from decimal import Decimal
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APITestCase
+from apps.accounts.models import User
+from apps.categories.models import Category
+from .models import Product
+
+
+class ProductDetailConditionalTests(APITestCase):
+    """
+    Conditional GET on the product detail view.
+    """
+
+    def setUp(self):
+        cache.clear()
+        seller = User.objects.create_user(
+            username='seller', email='seller@example.com', password='password',
+            first_name='Sam', last_name='Seller', is_seller=True,
+        )
+        category = Category.objects.create(name='Cameras', slug='cameras')
+        self.product = Product.objects.create(
+            title='Vintage camera',
+            description='Works well.',
+            price=Decimal('120.00'),
+            category=category,
+            seller=seller,
+        )
+        self.url = reverse('products:product-detail', args=[self.product.pk])
+
+    def test_detail_returns_etag(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['ETag'].startswith('W/"'))
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get(self.url)['ETag']
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
\ No newline at end of file
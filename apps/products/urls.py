@@ -10,8 +10,12 @@ urlpatterns = [
     path('', views.ProductListCreateView.as_view(), name='product-list-create'),
     path('<uuid:pk>/', views.ProductDetailView.as_view(), name='product-detail'),
     path('my-products/', views.MyProductsView.as_view(), name='my-products'),
+    path('my-products/export/', views.MyProductsExportView.as_view(), name='my-products-export'),
+    path('import/', views.import_products, name='import-products'),
     path('featured/', views.FeaturedProductsView.as_view(), name='featured-products'),
     path('trending/', views.TrendingProductsView.as_view(), name='trending-products'),
+    path('tags/', views.TagListView.as_view(), name='tag-list'),
+    path('tags/<slug:slug>/', views.ProductsByTagView.as_view(), name='products-by-tag'),
     path('<uuid:product_id>/like/', views.toggle_like, name='toggle-like'),
     path('<uuid:product_id>/sold/', views.mark_as_sold, name='mark-as-sold'),
 ]
\ No newline at end of file
@@ -2,25 +2,40 @@
 Views for products app.
 """
 from rest_framework import generics, status, permissions
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, parser_classes, permission_classes
+from rest_framework.parsers import FormParser, MultiPartParser
 from rest_framework.response import Response
+from rest_framework.views import APIView
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Q
-from .models import Product, ProductLike
-from .serializers import ProductSerializer, ProductListSerializer, ProductLikeSerializer
-from .filters import ProductFilter
+from rest_framework.filters import SearchFilter
+from django.db.models import Count, F, Max, Q
+from django.http import Http404
+from taggit.models import Tag
+from .models import Product, ProductLike, ProductTaggedItem
+from .serializers import (
+    ProductSerializer, ProductListSerializer, ProductListValuesSerializer, ProductLikeSerializer
+)
+from .filters import ProductFilter, BoostedFirstOrderingFilter
+from .importers import FORMATS, ProductImporter, read_rows
+from .tags import get_tag_index
+from apps.core.cache import CachedListMixin, ConditionalRetrieveMixin
+from apps.core.exports import ExportView
 from apps.core.permissions import IsOwnerOrReadOnly, CanCreateProduct
+from apps.core.querybudget import query_budget
+from apps.core.serializers import ValuesListMixin
+from apps.core.throttling import throttle_scope
 
 
-class ProductListCreateView(generics.ListCreateAPIView):
+class ProductListCreateView(CachedListMixin, ValuesListMixin, generics.ListCreateAPIView):
     """
     List all products or create a new product.
     """
-    queryset = Product.objects.filter(is_active=True, is_deleted=False)
+    queryset = Product.objects.filter(is_active=True)
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, CanCreateProduct]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    query_budget = 10
+    filter_backends = [DjangoFilterBackend, SearchFilter, BoostedFirstOrderingFilter]
     filterset_class = ProductFilter
+    values_serializer_class = ProductListValuesSerializer
     search_fields = ['title', 'description', 'tags__name']
     ordering_fields = ['price', 'created_at', 'views', 'likes']
     ordering = ['-created_at']
@@ -31,61 +46,181 @@ class ProductListCreateView(generics.ListCreateAPIView):
         return ProductSerializer
 
 
-class ProductDetailView(generics.RetrieveUpdateDestroyAPIView):
+class ProductDetailView(ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView):
     """
     Retrieve, update or delete a product.
     """
-    queryset = Product.objects.filter(is_active=True, is_deleted=False)
+    queryset = Product.objects.filter(is_active=True)
     serializer_class = ProductSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOwnerOrReadOnly]
+    query_budget = 15
+    # The view counter is in the body but left out of the ETag so that a
+    # view does not invalidate cached copies
+    weak_etag = True
 
-    def retrieve(self, request, *args, **kwargs):
+    def get_conditional_validators(self, request):
+        row = (
+            self.get_queryset()
+            .filter(pk=self.kwargs['pk'])
+            .values('updated_at', 'likes', 'seller_id', 'seller__updated_at', 'category__updated_at')
+            .annotate(
+                image_count=Count('images', distinct=True),
+                images_updated_at=Max('images__updated_at'),
+                tag_count=Count('tags', distinct=True),
+            )
+            # Meta.ordering is dropped from aggregate queries, and first()
+            # refuses an unordered one
+            .order_by('pk')
+            .first()
+        )
+        if row is None:
+            return None
+
+        self.seller_id = row['seller_id']
+        user_id = request.user.pk if request.user.is_authenticated else ''
+        etag_parts = [
+            row['updated_at'], row['likes'], row['seller__updated_at'],
+            row['category__updated_at'], row['image_count'],
+            row['images_updated_at'], row['tag_count'], user_id,
+        ]
+
+        # is_liked depends on the user, which Last-Modified cannot express
+        last_modified = None
+        if not request.user.is_authenticated:
+            last_modified = max(
+                value for value in (
+                    row['updated_at'], row['seller__updated_at'],
+                    row['category__updated_at'], row['images_updated_at'],
+                ) if value is not None
+            )
+        return etag_parts, last_modified
+
+    def _is_viewer(self, request, seller_id):
+        return not request.user.is_authenticated or request.user.pk != seller_id
+
+    def not_modified(self, request, *args, **kwargs):
+        # A revalidated view still counts as a view
+        if self._is_viewer(request, self.seller_id):
+            Product.objects.filter(pk=self.kwargs['pk']).update(views=F('views') + 1)
+        return super().not_modified(request, *args, **kwargs)
+
+    def full_response(self, request, *args, **kwargs):
         instance = self.get_object()
         # Increment views if not the owner
-        if not request.user.is_authenticated or request.user != instance.seller:
+        if self._is_viewer(request, instance.seller_id):
             instance.increment_views()
         
         serializer = self.get_serializer(instance)
         return Response(serializer.data)
 
 
-class MyProductsView(generics.ListAPIView):
+class MyProductsView(ValuesListMixin, generics.ListAPIView):
     """
     List current user's products.
     """
     serializer_class = ProductListSerializer
+    values_serializer_class = ProductListValuesSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 10
+
+    def get_queryset(self):
+        return Product.objects.filter(seller=self.request.user).order_by('-created_at')
+
+
+class MyProductsExportView(ExportView):
+    """
+    Stream the current user's products as CSV or JSONL.
+    """
     permission_classes = [permissions.IsAuthenticated]
+    export_name = 'products'
+    export_columns = (
+        ('id', 'id'),
+        ('title', 'title'),
+        ('description', 'description'),
+        ('price', 'price'),
+        ('condition', 'condition'),
+        ('category', 'category__slug'),
+        ('location', 'location'),
+        ('is_active', 'is_active'),
+        ('is_sold', 'is_sold'),
+        ('is_featured', 'is_featured'),
+        ('is_boosted', 'is_boosted'),
+        ('views', 'views'),
+        ('likes', 'likes'),
+        ('created_at', 'created_at'),
+        ('updated_at', 'updated_at'),
+    )
 
     def get_queryset(self):
-        return Product.objects.filter(
-            seller=self.request.user,
-            is_deleted=False
-        ).order_by('-created_at')
+        return Product.objects.filter(seller=self.request.user).order_by('-created_at')
 
 
-class FeaturedProductsView(generics.ListAPIView):
+class FeaturedProductsView(CachedListMixin, ValuesListMixin, generics.ListAPIView):
     """
     List featured products.
     """
     queryset = Product.objects.filter(
         is_active=True,
-        is_featured=True,
-        is_deleted=False
+        is_featured=True
     ).order_by('-created_at')
     serializer_class = ProductListSerializer
+    values_serializer_class = ProductListValuesSerializer
     permission_classes = [permissions.AllowAny]
+    query_budget = 10
 
 
-class TrendingProductsView(generics.ListAPIView):
+class TrendingProductsView(CachedListMixin, ValuesListMixin, generics.ListAPIView):
     """
     List trending products (most viewed).
     """
-    queryset = Product.objects.filter(
-        is_active=True,
-        is_deleted=False
-    ).order_by('-views', '-created_at')[:20]
+    queryset = Product.objects.filter(is_active=True).order_by('-views', '-created_at')[:20]
     serializer_class = ProductListSerializer
+    values_serializer_class = ProductListValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    query_budget = 10
+
+
+class TagListView(APIView):
+    """
+    Most used tags, or tags starting with ``?q=`` for autocomplete.
+    """
     permission_classes = [permissions.AllowAny]
+    query_budget = 5
+    max_limit = 50
+
+    def get(self, request):
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), self.max_limit))
+        except ValueError:
+            return Response({'error': 'limit must be a number'}, status=status.HTTP_400_BAD_REQUEST)
+
+        index = get_tag_index()
+        prefix = request.query_params.get('q', '').strip()
+        tags = index.suggest(prefix, limit) if prefix else index.top(limit)
+        return Response(tags)
+
+
+class ProductsByTagView(CachedListMixin, ValuesListMixin, generics.ListAPIView):
+    """
+    List active products carrying a tag.
+    """
+    serializer_class = ProductListSerializer
+    values_serializer_class = ProductListValuesSerializer
+    permission_classes = [permissions.AllowAny]
+    query_budget = 10
+
+    def get_tag_id(self):
+        if not hasattr(self, '_tag_id'):
+            self._tag_id = Tag.objects.filter(slug=self.kwargs['slug']).values_list('id', flat=True).first()
+            if self._tag_id is None:
+                raise Http404
+        return self._tag_id
+
+    def get_queryset(self):
+        # Read product ids from the (tag, object_id) index instead of joining
+        # through the generic relation
+        product_ids = ProductTaggedItem.objects.filter(tag_id=self.get_tag_id()).values('object_id')
+        return Product.objects.filter(is_active=True, id__in=product_ids).order_by('-created_at')
 
 
 @api_view(['POST'])
@@ -127,4 +262,34 @@ def mark_as_sold(request, product_id):
         return Response({'error': 'Product not found'}, status=status.HTTP_404_NOT_FOUND)
 
     product.mark_as_sold()
-    return Response({'message': 'Product marked as sold'})
\ No newline at end of file
+    return Response({'message': 'Product marked as sold'})
+
+
+@throttle_scope('product_import')
+@query_budget(None, duplicates=False)
+@api_view(['POST'])
+@permission_classes([permissions.IsAuthenticated, CanCreateProduct])
+@parser_classes([MultiPartParser, FormParser])
+def import_products(request):
+    """
+    Bulk create the current user's products from an uploaded CSV or JSONL file.
+
+    Valid rows are saved even when others fail; the response lists the
+    rejected rows with their errors. Images are referenced by their name in
+    media storage, under ``imports/<user id>/``.
+    """
+    upload = request.FILES.get('file')
+    if upload is None:
+        return Response({'error': 'No file uploaded'}, status=status.HTTP_400_BAD_REQUEST)
+
+    file_format = request.data.get('format') or upload.name.rsplit('.', 1)[-1].lower()
+    if file_format not in FORMATS:
+        return Response(
+            {'error': f"Unsupported format, use one of: {', '.join(FORMATS)}"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+
+    importer = ProductImporter(request.user)
+    report = importer.run(read_rows(upload, file_format))
+    response_status = status.HTTP_201_CREATED if report['created'] else status.HTTP_400_BAD_REQUEST
+    return Response(report, status=response_status)
\ No newline at end of file
@@ -2,11 +2,12 @@
 Admin configuration for reviews app.
 """
 from django.contrib import admin
+from apps.core.admin import SoftDeleteAdmin
 from .models import Review
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(SoftDeleteAdmin):
     list_display = (
         'product', 'reviewer', 'seller', 'rating', 
         'is_verified_purchase', 'created_at'
@@ -2,6 +2,7 @@
 Review models for New Revolution marketplace.
 """
 from django.db import models
+from django.db.models import Q
 from django.core.validators import MinValueValidator, MaxValueValidator
 from apps.core.models import BaseModel
 
@@ -36,8 +37,27 @@ class Review(BaseModel):
         db_table = 'reviews'
         verbose_name = 'Review'
         verbose_name_plural = 'Reviews'
-        unique_together = ('product', 'reviewer')
         ordering = ['-created_at']
+        constraints = [
+            # A deleted review does not stop the reviewer from writing a new one
+            models.UniqueConstraint(
+                fields=['product', 'reviewer'],
+                condition=Q(is_deleted=False),
+                name='reviews_live_product_reviewer_uniq',
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=['product', '-created_at'],
+                name='reviews_live_product_idx',
+                condition=Q(is_deleted=False),
+            ),
+            models.Index(
+                fields=['seller', '-created_at'],
+                name='reviews_live_seller_idx',
+                condition=Q(is_deleted=False),
+            ),
+        ]
 
     def __str__(self):
         return f"Review by {self.reviewer.display_name} for {self.product.title}"
\ No newline at end of file
@@ -14,6 +14,7 @@ class ReviewListCreateView(generics.ListCreateAPIView):
     queryset = Review.objects.all().order_by('-created_at')
     serializer_class = ReviewSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    query_budget = 15
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['product', 'seller', 'rating']
 
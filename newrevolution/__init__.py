@@ -1 +1,4 @@
-# New Revolution Backend
\ No newline at end of file
+# New Revolution Backend
+from .celery import app as celery_app
+
+__all__ = ('celery_app',)
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Celery configuration for newrevolution project.
+"""
+import os
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'newrevolution.settings')
+
+app = Celery('newrevolution')
+
+# Read CELERY_* settings from Django settings
+app.config_from_object('django.conf:settings', namespace='CELERY')
+
+# Load tasks.py modules from all installed apps
+app.autodiscover_tasks()
@@ -50,6 +50,7 @@ DJANGO_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.postgres',
 ]
 
 THIRD_PARTY_APPS = [
@@ -92,9 +93,15 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
-    'django_ratelimit.middleware.RatelimitMiddleware',
+    'apps.core.middleware.RateLimitHeadersMiddleware',
+    'apps.core.querybudget.QueryBudgetMiddleware',
 ]
 
+# Query budgets (apps.core.querybudget): 'off', 'warn' or 'raise' (for CI)
+QUERY_BUDGET_MODE = env('QUERY_BUDGET_MODE', default='warn' if DEBUG else 'off')
+QUERY_BUDGET_DEFAULT = 50  # for views that declare no query_budget
+QUERY_BUDGET_DUPLICATE_THRESHOLD = 3  # repeats of one query that count as N+1
+
 ROOT_URLCONF = 'newrevolution.urls'
 
 TEMPLATES = [
@@ -179,7 +186,7 @@ SITE_ID = 1
 # REST Framework configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.accounts.authentication.CachedJWTAuthentication',
         'rest_framework.authentication.SessionAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -201,15 +208,37 @@ REST_FRAMEWORK = {
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_THROTTLE_CLASSES': [
-        'rest_framework.throttling.AnonRateThrottle',
-        'rest_framework.throttling.UserRateThrottle'
+        'apps.core.throttling.GCRAThrottle',
     ],
+    # Rate limit budgets; views opt into a named one with ``throttle_scope``
     'DEFAULT_THROTTLE_RATES': {
         'anon': '100/hour',
-        'user': '1000/hour'
+        'user': '1000/hour',
+        'register': '5/min',
+        'login': '10/min',
+        'password_change': '3/min',
+        'verify_email': '5/min',
+        'phone_verification_send': '3/min',
+        'verify_phone': '5/min',
+        'product_import': '10/hour',
+        'export': '20/hour',
     }
 }
 
+# Use orjson for JSON rendering and parsing if available
+try:
+    import orjson
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = [
+        'apps.core.renderers.ORJSONRenderer',
+    ]
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = [
+        'apps.core.parsers.ORJSONParser',
+        'rest_framework.parsers.MultiPartParser',
+        'rest_framework.parsers.FormParser',
+    ]
+except ImportError:
+    pass
+
 # JWT Configuration
 from datetime import timedelta
 
@@ -234,11 +263,22 @@ SIMPLE_JWT = {
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
     'JTI_CLAIM': 'jti',
+    'TOKEN_REFRESH_SERIALIZER': 'apps.accounts.serializers.TokenRefreshSerializer',
     'SLIDING_TOKEN_REFRESH_EXP_CLAIM': 'refresh_exp',
     'SLIDING_TOKEN_LIFETIME': timedelta(minutes=60),
     'SLIDING_TOKEN_REFRESH_LIFETIME': timedelta(days=1),
 }
 
+# Seconds a JWT principal (apps.accounts.authentication) stays cached
+AUTH_PRINCIPAL_CACHE_TIMEOUT = 300
+
+# Token revocation (apps.accounts.tokens): seconds between syncs of each
+# process's revocation filter, how many revocations the filter holds, and
+# how long a missing revocation log entry is waited for before it is skipped
+AUTH_REVOCATION_SYNC_INTERVAL = 1
+AUTH_REVOCATION_FILTER_CAPACITY = 100000
+AUTH_REVOCATION_GAP_TIMEOUT = 10
+
 # CORS configuration
 CORS_ALLOWED_ORIGINS = [
     "http://localhost:3000",
@@ -281,6 +321,27 @@ try:
 except ImportError:
     pass
 
+# Read-through catalog cache (apps.core.cache)
+CATALOG_LOCAL_CACHE_SIZE = 128
+CATALOG_VERSION_TTL = 5  # seconds a process trusts its copy of a model version
+
+# Rows per statement for bulk soft delete, restore and purge (apps.core.models)
+SOFT_DELETE_BATCH_SIZE = 1000
+
+# Bulk product import (apps.products.importers): rows per transaction, and
+# row errors kept for the report
+PRODUCT_IMPORT_CHUNK_SIZE = 500
+PRODUCT_IMPORT_MAX_ERRORS = 1000
+
+# Rows fetched per server-side cursor round trip by streaming exports
+# (apps.core.exports)
+EXPORT_CHUNK_SIZE = 2000
+
+# Readiness probe (apps.core.health): seconds per dependency check, and
+# seconds a result is reused
+HEALTH_CHECK_TIMEOUT = 2
+HEALTH_CHECK_CACHE_SECONDS = 5
+
 # Session configuration
 SESSION_ENGINE = 'django.contrib.sessions.backends.cache'
 SESSION_CACHE_ALIAS = 'default'
@@ -306,9 +367,29 @@ try:
 except ImportError:
     pass
 
+# Export Prometheus metrics (apps.core.metrics) if prometheus_client is available.
+# /metrics needs METRICS_TOKEN as a bearer token, or without one a client
+# address in METRICS_ALLOWED_IPS (addresses or networks); DEBUG serves anyone.
+METRICS_TOKEN = env('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = env.list('METRICS_ALLOWED_IPS', default=['127.0.0.1', '::1'])
+try:
+    import prometheus_client
+    METRICS_ENABLED = True
+    MIDDLEWARE.insert(0, 'apps.core.metrics.MetricsMiddleware')
+    # Only the known backends are instrumented; others are left as they are
+    CACHES['default']['BACKEND'] = {
+        'django.core.cache.backends.locmem.LocMemCache': 'apps.core.metrics.InstrumentedLocMemCache',
+        'django_redis.cache.RedisCache': 'apps.core.metrics.InstrumentedRedisCache',
+    }.get(CACHES['default']['BACKEND'], CACHES['default']['BACKEND'])
+except ImportError:
+    METRICS_ENABLED = False
+
 # Email configuration with Resend
 EMAIL_BACKEND = 'apps.core.backends.ResendEmailBackend'
 RESEND_API_KEY = env('RESEND_API_KEY', default='')
+RESEND_API_URL = env('RESEND_API_URL', default='https://api.resend.com')
+RESEND_TIMEOUT = 10
+RESEND_MAX_RETRIES = 3
 DEFAULT_FROM_EMAIL = env('DEFAULT_FROM_EMAIL', default='noreply@newrevolution.com')
 SERVER_EMAIL = DEFAULT_FROM_EMAIL
 
@@ -316,6 +397,8 @@ SERVER_EMAIL = DEFAULT_FROM_EMAIL
 STRIPE_PUBLISHABLE_KEY = env('STRIPE_PUBLISHABLE_KEY', default='')
 STRIPE_SECRET_KEY = env('STRIPE_SECRET_KEY', default='')
 STRIPE_WEBHOOK_SECRET = env('STRIPE_WEBHOOK_SECRET', default='')
+STRIPE_API_BASE = env('STRIPE_API_BASE', default='')  # e.g. a local stripe-mock
+STRIPE_EVENT_MAX_ATTEMPTS = 5  # tries to apply a webhook event before it is marked failed
 
 # Celery configuration (optional)
 CELERY_BROKER_URL = REDIS_URL
@@ -324,6 +407,39 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {
+    'deliver-email-outbox': {
+        'task': 'apps.notifications.tasks.deliver_email_outbox',
+        'schedule': 30.0,
+    },
+    'expire-product-boosts': {
+        'task': 'apps.products.tasks.expire_product_boosts',
+        'schedule': 60.0,
+    },
+    'recount-tags': {
+        'task': 'apps.products.tasks.recount_tags',
+        'schedule': 3600.0,
+    },
+    'process-pending-stripe-events': {
+        'task': 'apps.payments.tasks.process_pending_stripe_events',
+        'schedule': 300.0,
+    },
+}
+
+# Email outbox delivery
+EMAIL_OUTBOX_BATCH_SIZE = 100
+EMAIL_OUTBOX_MAX_ATTEMPTS = 5
+EMAIL_OUTBOX_SENDING_TIMEOUT = 600  # seconds before a stuck 'sending' row is retried
+EMAIL_OUTBOX_RATE_LIMITS = {
+    'resend': 600,  # messages per minute
+}
+
+# Product boosts
+BOOST_EXPIRY_BATCH_SIZE = 500
+
+# Seconds a process serves its own tag autocomplete index when the cache is
+# not Redis (apps.products.tags)
+TAG_INDEX_LOCAL_TTL = 60
 
 # Security settings for production
 if not DEBUG:
@@ -401,20 +517,24 @@ if SENTRY_DSN:
         environment='production' if not DEBUG else 'development',
     )
 
-# Rate limiting configuration
-RATELIMIT_ENABLE = True
-RATELIMIT_USE_CACHE = 'default'
-
 # File upload settings
-FILE_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
+FILE_UPLOAD_MAX_MEMORY_SIZE = 2_621_440  # 2.5MB, larger uploads spool to disk
 DATA_UPLOAD_MAX_MEMORY_SIZE = 10 * 1024 * 1024  # 10MB
 DATA_UPLOAD_MAX_NUMBER_FIELDS = 1000
 
+# Image processing limits
+MAX_IMAGE_PIXELS = env.int('MAX_IMAGE_PIXELS', default=40_000_000)  # ~6300x6300
+IMAGE_SPOOL_MAX_SIZE = 2 * 1024 * 1024  # 2MB
+IMAGE_UPLOAD_MAX_WORKERS = env.int('IMAGE_UPLOAD_MAX_WORKERS', default=4)
+
 # Taggit configuration
 TAGGIT_CASE_INSENSITIVE = True
 
 # Admin configuration
 ADMIN_URL = env('ADMIN_URL', default='admin/')
+# Unfiltered admin changelists of tables at least this big show the
+# planner's row estimate instead of running COUNT(*) (apps.core.admin)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = 100000
 
 # API versioning
 API_VERSION = 'v1'
@@ -6,7 +6,7 @@ from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
 from rest_framework.routers import DefaultRouter
-from apps.core.views import HealthCheckView, APIRootView
+from apps.core.views import HealthCheckView, LivenessView, APIRootView
 
 # API Router
 router = DefaultRouter()
@@ -27,8 +27,10 @@ urlpatterns = [
     # Admin
     path(settings.ADMIN_URL, admin.site.urls),
     
-    # Health check
+    # Health checks
     path('health/', HealthCheckView.as_view(), name='health-check'),
+    path('health/live/', LivenessView.as_view(), name='health-live'),
+    path('health/ready/', HealthCheckView.as_view(), name='health-ready'),
     
     # API
     path('api/v1/', include(api_patterns)),
@@ -37,6 +39,11 @@ urlpatterns = [
     path('api/v1/', include(router.urls)),
 ]
 
+if settings.METRICS_ENABLED:
+    from apps.core.metrics import metrics_view
+
+    urlpatterns.append(path('metrics', metrics_view, name='metrics'))
+
 # Serve media files in development
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)